@@ -5,14 +5,36 @@ Cache ADB commands và API calls để tăng tốc đáng kể
 
 import time
 import json
+import pickle
 import hashlib
+import heapq
+import itertools
 import threading
 import os
-from typing import Any, Optional, Dict, Tuple, List
+import sys
+import weakref
+from typing import Any, Callable, Optional, Dict, Tuple, List
 from dataclasses import dataclass
 from enum import Enum
-from collections import defaultdict
-from PyQt6.QtCore import QObject, pyqtSignal
+from collections import defaultdict, Counter, OrderedDict
+from PyQt6.QtCore import QObject, QTimer, QCoreApplication, pyqtSignal
+
+# Optional C-implemented LRU mapping (pip install lru-dict)
+try:
+    from lru import LRU
+    LRU_DICT_AVAILABLE = True
+except ImportError:
+    LRU_DICT_AVAILABLE = False
+
+# Writes within this window are coalesced into one disk flush
+CACHE_FLUSH_DELAY_MS = 1000
+# Most accessed entries are written first in the cache file and merged
+# first on load, so they win the capacity left after in-memory entries
+CACHE_PREWARM_KEYS = 64
+# The admission frequency sketch is halved after this many misses per slot
+CACHE_FREQUENCY_RESET_FACTOR = 10
+# Default memory budget of SmartCache, on top of the max_size entry limit
+CACHE_MAX_BYTES = 64 * 1024 * 1024
 
 
 class SmartCache(QObject):
@@ -21,16 +43,58 @@ class SmartCache(QObject):
     cache_hit = pyqtSignal(str)
     cache_miss = pyqtSignal(str)
     cache_cleared = pyqtSignal()
+    # Emitted from any thread; the timer is (re)started on the thread owning it
+    _flush_requested = pyqtSignal()
 
-    def __init__(self, max_size: int = 1000, persistent: bool = True):
+    def __init__(self, max_size: int = 1000, persistent: bool = True, task_manager=None,
+                 max_bytes: int = CACHE_MAX_BYTES, sizer: Optional[Callable[[Any], int]] = None):
         super().__init__()
-        self.cache: Dict[str, Any] = {}
-        self.timestamps: Dict[str, float] = {}
+        # Bound once: get/set/is_valid run on every lookup
+        self._time = time.time
+        self._hit = self.cache_hit.emit
+        self._miss = self.cache_miss.emit
+        # key -> (value, cache_type, timestamp). lru.LRU tracks recency and
+        # evicts by itself; the OrderedDict fallback is kept in LRU -> MRU order.
+        if LRU_DICT_AVAILABLE:
+            self.cache = LRU(max_size, callback=self._on_evicted)
+        else:
+            self.cache: "OrderedDict[str, Tuple[Any, str, float]]" = OrderedDict()
         self.access_count: Dict[str, int] = defaultdict(int)
-        self.access_order: List[str] = []
+        # Admission filter (LFUDA over a TinyLFU-style sketch): miss counts
+        # of requested keys, including ones not in the cache
+        self._frequency: Counter = Counter()
+        self._misses = 0
+        # Opt-in weak tier (set(..., weak=True)) for large objects the GC may
+        # reclaim; not persisted and not counted against max_size
+        self.weak_cache: "weakref.WeakValueDictionary[str, Any]" = weakref.WeakValueDictionary()
+        self._weak_meta: Dict[str, Tuple[str, float]] = {}
         self.max_size = max_size
+        # Approximate byte size per strong entry. sys.getsizeof is shallow;
+        # pass a sizer to measure containers deeply.
+        self.max_bytes = max_bytes
+        self.sizer = sizer or sys.getsizeof
+        self.sizes: Dict[str, int] = {}
+        self.total_bytes = 0
         self.persistent = persistent
-        self.cache_file = os.path.expanduser("~/.mumu_cache.json")
+        self.cache_file = os.path.expanduser("~/.mumu_cache.pkl")
+
+        # Debounced persistence: set() marks the cache dirty and the timer
+        # flushes once writes settle, on a background worker
+        self._task_manager = task_manager
+        self._dirty = False
+        # Serializes background reads and writes of the cache file
+        self._file_lock = threading.Lock()
+        # Snapshots are numbered when taken; a write older than the last one
+        # on disk (a slow background flush racing flush()) is skipped
+        self._generations = itertools.count(1)
+        self._written_generation = 0
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush_to_disk)
+        self._flush_requested.connect(self._restart_flush_timer)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush)
 
         self.ttl_map = {
             'instance_static': 900,    # 15 minutes - static info like name, path
@@ -45,116 +109,355 @@ class SmartCache(QObject):
             self.load_cache()
 
     def load_cache(self):
-        """Load cache from disk to eliminate cold start cache misses"""
+        """Warm the cache from disk in the background so the GUI paints first"""
+        if QCoreApplication.instance() is None:
+            self._load_cache_sync()
+            return
+        self.task_manager.task_completed.connect(self._on_cache_loaded)
+        self.task_manager.task_failed.connect(self._on_cache_load_failed)
+        if not self.task_manager.submit_task("smart_cache_load", self._read_cache_file, 10):
+            self._disconnect_load_signals()
+            self._load_cache_sync()
+
+    def _load_cache_sync(self):
+        """Load cache from disk on the calling thread"""
+        for section in self._read_cache_file():
+            self._restore_entries(section)
+
+    def _read_cache_file(self) -> List[Dict[str, Any]]:
+        """Unpickle the cache file sections (safe to run on a worker thread)"""
+        sections = []
         try:
             if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                    self.cache = cache_data.get('cache', {})
-                    self.timestamps = cache_data.get('timestamps', {})
-                    for key in list(self.timestamps.keys()):
-                        self.timestamps[key] = float(self.timestamps[key])
-                    current_time = time.time()
-                    expired_keys = [
-                        key for key in self.timestamps
-                        if current_time - self.timestamps[key] > self.ttl_map.get('instance_dynamic', 300)
-                    ]
-                    for key in expired_keys:
-                        self.cache.pop(key, None)
-                        self.timestamps.pop(key, None)
+                # File layout: pickled hot section, then pickled tail section
+                with self._file_lock, open(self.cache_file, 'rb') as f:
+                    while True:
+                        try:
+                            sections.append(pickle.load(f))
+                        except EOFError:
+                            break
+        except pickle.UnpicklingError as e:
+            # Truncated or corrupt file: keep whatever sections were read
+            print(f"Cache file unreadable, starting empty (non-critical): {e}")
         except Exception as e:
             print(f"Cache load error (non-critical): {e}")
+        return sections
+
+    def _on_cache_loaded(self, task_id: str, sections: Any):
+        """Merge the background-loaded sections on the GUI thread"""
+        if task_id != "smart_cache_load":
+            return
+        self._disconnect_load_signals()
+        # Hot section first so it wins the remaining capacity; keys set
+        # while the load was running keep their in-memory values
+        for section in sections:
+            self._restore_entries(section)
+
+    def _on_cache_load_failed(self, task_id: str, error: str):
+        """Start empty when the background load fails"""
+        if task_id != "smart_cache_load":
+            return
+        self._disconnect_load_signals()
+        print(f"Cache load error (non-critical): {error}")
+
+    def _disconnect_load_signals(self):
+        """Drop the one-shot load handlers"""
+        self.task_manager.task_completed.disconnect(self._on_cache_loaded)
+        self.task_manager.task_failed.disconnect(self._on_cache_load_failed)
+
+    def _restore_entries(self, section: Dict[str, Any]):
+        """Merge fresh persisted entries; entries already in memory win"""
+        current_time = time.time()
+        max_age = self.ttl_map.get('instance_dynamic', 300)
+        counts = section.get('access_count', {})
+        # Oldest entries first so the restored order is LRU -> MRU
+        entries = sorted(section.get('cache', {}).items(), key=lambda item: item[1][2])
+        for key, entry in entries:
+            if len(self.cache) >= self.max_size:
+                break
+            if key in self.cache or current_time - entry[2] > max_age:
+                continue
+            size = self.sizer(entry[0])
+            if self.total_bytes + size > self.max_bytes:
+                continue
+            self.cache[key] = entry
+            self.access_count[key] = counts.get(key, 1)
+            self.sizes[key] = size
+            self.total_bytes += size
 
     def save_cache(self):
-        """Save cache to disk for persistence across app restarts"""
+        """Save cache to disk from a background worker"""
+        # A pending debounce timer finds the cache clean and does nothing
+        self._dirty = True
+        if QCoreApplication.instance() is None:
+            self.flush()
+            return
+        self._flush_to_disk()
+
+    def _save_cache_sync(self):
+        """Save cache to disk on the calling thread"""
+        if self.persistent:
+            self._write_cache_file(self._snapshot(), next(self._generations))
+
+    def flush(self):
+        """Synchronously write pending changes (called on application quit)
+
+        Must run on the thread owning the cache, like the quit handler.
+        """
+        self._flush_timer.stop()
+        if self._dirty:
+            self._dirty = False
+            self._save_cache_sync()
+
+    def _schedule_flush(self):
+        """Mark the cache dirty and (re)start the debounce timer"""
+        self._dirty = True
+        if QCoreApplication.instance() is None:
+            # No event loop to fire the timer (scripts, tests): write now
+            self.flush()
+            return
+        self._flush_requested.emit()
+
+    def _restart_flush_timer(self):
+        """Restart the debounce timer (always runs on the timer's thread)"""
+        self._flush_timer.start(CACHE_FLUSH_DELAY_MS)
+
+    def _flush_to_disk(self):
+        """Write pending changes from a background worker"""
+        if not self._dirty or not self.persistent:
+            return
+        # Copied on this thread so the worker never sees the cache mutate
+        snapshot = self._snapshot()
+        generation = next(self._generations)
+        if self.task_manager.submit_task("smart_cache_flush", self._write_cache_file, -5,
+                                         snapshot, generation):
+            self._dirty = False
+        else:
+            # Previous flush still running, try again after it
+            self._flush_requested.emit()
+
+    @property
+    def task_manager(self):
+        """Task manager running background loads and flushes, created on first use"""
+        if self._task_manager is None:
+            # Imported here: the ui package itself imports this module
+            from ui.performance import AsyncTaskManager
+            self._task_manager = AsyncTaskManager(max_workers=1)
+        return self._task_manager
+
+    def _snapshot(self) -> List[Dict[str, Any]]:
+        """Serializable copy of the cache, split into hot and tail sections"""
+        entries = dict(self.cache.items())
+        counts = {key: self.access_count.get(key, 0) for key in entries}
+        hot_keys = heapq.nlargest(CACHE_PREWARM_KEYS, counts, key=counts.get)
+        hot = {key: entries.pop(key) for key in hot_keys}
+        return [
+            {'cache': hot, 'access_count': {key: counts[key] for key in hot}},
+            {'cache': entries, 'access_count': {key: counts[key] for key in entries}},
+        ]
+
+    def _write_cache_file(self, sections: List[Dict[str, Any]], generation: int):
+        """Write cache sections atomically (temp file + rename)"""
         try:
-            if self.persistent:
-                cache_data = {
-                    'cache': self.cache,
-                    'timestamps': {k: str(v) for k, v in self.timestamps.items()}
-                }
-                with open(self.cache_file, 'w', encoding='utf-8') as f:
-                    json.dump(cache_data, f, ensure_ascii=False, indent=2)
+            tmp_file = self.cache_file + '.tmp'
+            with self._file_lock:
+                if generation < self._written_generation:
+                    return
+                self._written_generation = generation
+                with open(tmp_file, 'wb') as f:
+                    for section in sections:
+                        pickle.dump(section, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_file, self.cache_file)
         except Exception as e:
             print(f"Cache save error (non-critical): {e}")
 
     def get(self, key: str, cache_type: str = 'default') -> Optional[Any]:
         """Get cached value if valid"""
         if not self.is_valid(key, cache_type):
-            self.cache_miss.emit(key)
+            value = self._get_weak(key)
+            if value is not None:
+                self._hit(key)
+                return value
+            self._record_miss(key)
+            self._miss(key)
             return None
 
         self.access_count[key] += 1
-        if key in self.access_order:
-            self.access_order.remove(key)
-        self.access_order.append(key)
+        if not LRU_DICT_AVAILABLE:
+            self.cache.move_to_end(key)
 
-        self.cache_hit.emit(key)
-        return self.cache.get(key)
+        self._hit(key)
+        return self.cache[key][0]
 
-    def set(self, key: str, value: Any, cache_type: str = 'default'):
-        """Set cached value with timestamp, LRU tracking, and auto-persistence"""
-        if len(self.cache) >= self.max_size:
-            self._evict_lru()
+    def set(self, key: str, value: Any, cache_type: str = 'default', weak: bool = False):
+        """Set cached value with timestamp, LRU tracking, and auto-persistence
 
-        self.cache[key] = value
-        self.timestamps[key] = time.time()
-        self.access_count[key] = 1
+        With weak=True the value is only weakly referenced and disappears once
+        nothing else uses it. Values that can't be weakly referenced (str,
+        int, tuple, ...) are cached normally.
+        """
+        if weak and self._set_weak(key, value, cache_type):
+            return
+        self._remove_weak(key)
 
-        if key in self.access_order:
-            self.access_order.remove(key)
-        self.access_order.append(key)
+        size = self.sizer(value)
+        if size > self.max_bytes:
+            # Never fits: drop any stale copy instead of flushing everything
+            if key in self.cache:
+                self._remove_key(key)
+                if self.persistent:
+                    self._schedule_flush()
+            return
 
-        self.cache[f"{key}_type"] = cache_type
+        if key in self.cache:
+            if not LRU_DICT_AVAILABLE:
+                self.cache.move_to_end(key)
+        elif len(self.cache) >= self.max_size:
+            # Scan resistance: a one-shot key doesn't push out a popular entry
+            if not self._admit(key):
+                return
+            if not LRU_DICT_AVAILABLE:
+                self._evict_lru()
+            # lru.LRU evicts the same victim on insert (see _on_evicted)
+
+        self.cache[key] = (value, cache_type, self._time())
+        self.access_count[key] = 1
+        self.total_bytes += size - self.sizes.get(key, 0)
+        self.sizes[key] = size
+        while self.total_bytes > self.max_bytes:
+            self._evict_lru()
 
         if self.persistent:
-            self.save_cache()
+            self._schedule_flush()
+
+    def _set_weak(self, key: str, value: Any, cache_type: str) -> bool:
+        """Store value in the weak tier; False if it can't be weakly referenced"""
+        try:
+            self.weak_cache[key] = value
+        except TypeError:
+            return False
+        if key in self.cache:
+            # The strong copy must not come back from the persisted file
+            self._remove_key(key)
+            if self.persistent:
+                self._schedule_flush()
+        self._weak_meta[key] = (cache_type, time.time())
+        if len(self._weak_meta) > self.max_size:
+            # Drop metadata of values the GC already reclaimed
+            for stale in [k for k in self._weak_meta if k not in self.weak_cache]:
+                del self._weak_meta[stale]
+        return True
+
+    def _get_weak(self, key: str) -> Optional[Any]:
+        """Live, unexpired value from the weak tier, or None"""
+        value = self.weak_cache.get(key)
+        if value is None:
+            self._weak_meta.pop(key, None)
+            return None
+        cache_type, timestamp = self._weak_meta[key]
+        if self._time() - timestamp >= self.ttl_map.get(cache_type, self.ttl_map['default']):
+            self._remove_weak(key)
+            return None
+        return value
+
+    def _remove_weak(self, key: str):
+        """Remove key from the weak tier"""
+        self.weak_cache.pop(key, None)
+        self._weak_meta.pop(key, None)
 
     def is_valid(self, key: str, cache_type: str) -> bool:
         """Check if cached value is still valid"""
-        if key not in self.cache or key not in self.timestamps:
+        entry = self.cache.get(key)
+        if entry is None:
             return False
 
-        stored_type = self.cache.get(f"{key}_type", cache_type)
+        _, stored_type, timestamp = entry
         ttl = self.ttl_map.get(stored_type, self.ttl_map['default'])
 
-        elapsed = time.time() - self.timestamps[key]
+        elapsed = self._time() - timestamp
         return elapsed < ttl
 
     def invalidate(self, pattern: str = None):
         """Invalidate cache entries"""
         if pattern:
-            keys_to_remove = [k for k in self.cache.keys() if pattern in k and not k.endswith('_type')]
+            keys_to_remove = [k for k in self.cache.keys() if pattern in k]
             for key in keys_to_remove:
                 self._remove_key(key)
+            for key in [k for k in self._weak_meta if pattern in k]:
+                self._remove_weak(key)
         else:
             self.cache.clear()
-            self.timestamps.clear()
             self.access_count.clear()
-            self.access_order.clear()
+            self.sizes.clear()
+            self.total_bytes = 0
+            self.weak_cache.clear()
+            self._weak_meta.clear()
+            self._frequency.clear()
+            self._misses = 0
             self.cache_cleared.emit()
 
+    def _record_miss(self, key: str):
+        """Count a miss in the admission sketch"""
+        self._misses += 1
+        self._frequency[key] += 1
+        if self._misses >= CACHE_FREQUENCY_RESET_FACTOR * self.max_size:
+            # Halve all counts so stale popularity fades (TinyLFU reset)
+            self._frequency = Counter(
+                {k: count // 2 for k, count in self._frequency.items() if count > 1}
+            )
+            self._misses = 0
+
+    def _lru_key(self) -> Optional[str]:
+        """Key that the next eviction would remove"""
+        if not self.cache:
+            return None
+        if LRU_DICT_AVAILABLE:
+            return self.cache.peek_last_item()[0]
+        return next(iter(self.cache))
+
+    def _admit(self, key: str) -> bool:
+        """LFUDA admission: displace the LRU victim only if key is as popular"""
+        victim = self._lru_key()
+        if victim is None:
+            return True
+        # The write itself counts as one access, like a new entry's access_count;
+        # the dynamic age lets new keys in over time even against old favourites
+        dynamic_age = self._misses / max(len(self.cache), 1)
+        frequency = self._frequency[key] + 1
+        return frequency + dynamic_age >= self.access_count.get(victim, 0)
+
     def _evict_lru(self):
         """Evict least recently used item"""
-        if self.access_order:
-            lru_key = self.access_order[0]
-            self._remove_key(lru_key)
+        if self.cache:
+            if LRU_DICT_AVAILABLE:
+                lru_key, _ = self.cache.popitem()
+            else:
+                lru_key, _ = self.cache.popitem(last=False)
+            self._forget(lru_key)
+
+    def _on_evicted(self, key: str, entry: Tuple[Any, str, float]):
+        """Drop metadata of an entry lru.LRU evicted on its own"""
+        self._forget(key)
 
     def _remove_key(self, key: str):
         """Remove key and its metadata"""
         self.cache.pop(key, None)
-        self.cache.pop(f"{key}_type", None)
-        self.timestamps.pop(key, None)
+        self._forget(key)
+
+    def _forget(self, key: str):
+        """Drop access count and byte size of a key no longer cached"""
         self.access_count.pop(key, None)
-        if key in self.access_order:
-            self.access_order.remove(key)
+        self.total_bytes -= self.sizes.pop(key, 0)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         total_accesses = sum(self.access_count.values())
         return {
-            'size': len([k for k in self.cache.keys() if not k.endswith('_type')]),
+            'size': len(self.cache),
+            'weak_size': len(self.weak_cache),
             'max_size': self.max_size,
+            'total_bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
             'total_accesses': total_accesses,
             'hit_rate': len(self.access_count) / max(total_accesses, 1),
             'keys': list(self.cache.keys())
@@ -0,0 +1,210 @@
+"""
+SmartCache behaviour tests: LRU order, LFUDA admission, weak tier,
+byte budget and the hot/tail persistence format
+"""
+
+import gc
+import os
+import pickle
+import sys
+import time
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import optimizations.smart_cache as smart_cache
+from optimizations.smart_cache import SmartCache
+
+
+class _NoApp:
+    """Stand-in for QCoreApplication: no event loop, so saves and loads are synchronous"""
+
+    @staticmethod
+    def instance():
+        return None
+
+
+class _Big:
+    """Weakly referenceable value"""
+
+
+@pytest.fixture(params=[True, False], ids=["lru-dict", "ordereddict"])
+def lru_backend(request, monkeypatch):
+    """Run a test against both the lru.LRU and the OrderedDict storage"""
+    if request.param and not smart_cache.LRU_DICT_AVAILABLE:
+        pytest.skip("lru-dict not installed")
+    monkeypatch.setattr(smart_cache, "LRU_DICT_AVAILABLE", request.param)
+
+
+@pytest.fixture
+def cache_home(tmp_path, monkeypatch):
+    """Point ~/.mumu_cache.pkl into a temporary directory"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    monkeypatch.setattr(smart_cache, "QCoreApplication", _NoApp)
+    return tmp_path / ".mumu_cache.pkl"
+
+
+def _read_sections(path):
+    sections = []
+    with open(path, "rb") as f:
+        while True:
+            try:
+                sections.append(pickle.load(f))
+            except EOFError:
+                return sections
+
+
+def test_evicts_least_recently_used(lru_backend):
+    cache = SmartCache(max_size=3, persistent=False)
+    for key in "abc":
+        cache.set(key, key.upper())
+    assert cache.get("a") == "A"
+
+    cache.set("d", "D")
+
+    assert sorted(cache.cache.keys()) == ["a", "c", "d"]
+    assert cache.get("b") is None
+
+
+def test_admission_resists_scans(lru_backend):
+    cache = SmartCache(max_size=3, persistent=False)
+    for key in "abc":
+        cache.set(key, key)
+    for _ in range(3):
+        for key in "abc":
+            cache.get(key)
+
+    # One-shot keys don't push out the popular entries
+    for i in range(5):
+        key = f"scan{i}"
+        if cache.get(key) is None:
+            cache.set(key, i)
+    assert sorted(cache.cache.keys()) == ["a", "b", "c"]
+
+    # A key that keeps missing is admitted
+    for _ in range(3):
+        cache.get("hot")
+    cache.set("hot", 1)
+    assert cache.get("hot") == 1
+
+
+def test_weak_tier(lru_backend):
+    cache = SmartCache(max_size=3, persistent=False)
+    value = _Big()
+    cache.set("big", value, weak=True)
+    assert cache.get("big") is value
+    assert "big" not in cache.cache
+
+    del value
+    gc.collect()
+    assert cache.get("big") is None
+    assert cache.get_stats()["weak_size"] == 0
+
+    # Values without weak references are cached strongly
+    cache.set("text", "value", weak=True)
+    assert "text" in cache.cache and cache.get("text") == "value"
+
+    # Moving a key between tiers leaves a single copy
+    moved = _Big()
+    cache.set("text", moved, weak=True)
+    assert "text" not in cache.cache and cache.get("text") is moved
+    cache.set("text", 5)
+    assert "text" not in cache.weak_cache and cache.get("text") == 5
+
+
+def test_byte_budget(lru_backend):
+    cache = SmartCache(max_size=100, persistent=False, max_bytes=1000, sizer=len)
+    for key in "abcd":
+        cache.set(key, "x" * 300)
+    assert sorted(cache.cache.keys()) == ["b", "c", "d"]
+    assert cache.total_bytes == 900
+
+    cache.set("b", "y" * 50)
+    assert cache.total_bytes == 650
+
+    # Larger than the whole budget: not cached, nothing else evicted
+    cache.set("big", "z" * 2000)
+    assert "big" not in cache.cache
+    assert cache.total_bytes == 650
+
+    cache.invalidate("c")
+    assert cache.total_bytes == 350
+    assert sorted(cache.sizes) == sorted(cache.cache.keys()) == ["b", "d"]
+
+    cache.invalidate()
+    assert cache.total_bytes == 0 and cache.sizes == {}
+
+
+def test_size_eviction_forgets_metadata(lru_backend):
+    cache = SmartCache(max_size=2, persistent=False, sizer=len)
+    for key in "abc":
+        cache.set(key, "q")
+    assert sorted(cache.sizes) == sorted(cache.cache.keys())
+    assert sorted(cache.access_count) == sorted(cache.cache.keys())
+    assert cache.total_bytes == 2
+
+
+def test_persistence_round_trip(cache_home):
+    cache = SmartCache(max_size=200)
+    for i in range(100):
+        cache.set(f"k{i}", i)
+    for _ in range(10):
+        cache.get("k5")
+    cache.save_cache()
+
+    hot, tail = _read_sections(cache_home)
+    assert "k5" in hot["cache"]
+    assert len(hot["cache"]) == smart_cache.CACHE_PREWARM_KEYS
+    assert len(hot["cache"]) + len(tail["cache"]) == 100
+
+    restored = SmartCache(max_size=200)
+    assert sorted(restored.cache.keys()) == sorted(cache.cache.keys())
+    assert restored.get("k42") == 42
+    assert restored.access_count["k5"] == 11
+
+    # With little capacity the hot entries are restored first
+    small = SmartCache(max_size=1)
+    assert list(small.cache.keys()) == ["k5"]
+
+
+def test_loads_legacy_single_section_file(cache_home):
+    now = time.time()
+    with open(cache_home, "wb") as f:
+        pickle.dump({
+            "cache": {"fresh": ("value", "default", now), "stale": ("old", "default", now - 3600)},
+            "access_count": {"fresh": 3, "stale": 7},
+        }, f)
+
+    cache = SmartCache()
+
+    assert cache.get("fresh") == "value"
+    assert "stale" not in cache.cache
+    assert cache.access_count["fresh"] == 4
+
+
+def test_corrupt_tail_keeps_hot_section(cache_home):
+    with open(cache_home, "wb") as f:
+        pickle.dump({"cache": {"hot": (1, "default", time.time())}, "access_count": {"hot": 5}}, f)
+        f.write(b"\x80\x05truncated")
+
+    cache = SmartCache()
+
+    assert cache.get("hot") == 1
+
+
+def test_stale_background_write_is_skipped(cache_home):
+    cache = SmartCache()
+    cache.set("a", 1)
+    old_snapshot = (cache._snapshot(), next(cache._generations))
+    cache.set("b", 2)
+
+    # A flush submitted earlier finishes after the newer synchronous write
+    cache._write_cache_file(*old_snapshot)
+
+    keys = set()
+    for section in _read_sections(cache_home):
+        keys.update(section["cache"])
+    assert keys == {"a", "b"}
@@ -8,34 +8,61 @@ from pathlib import Path
 qtcore = types.ModuleType("PyQt6.QtCore")
 
 class QObject:
-    pass
+    def __init__(self, *args, **kwargs):
+        pass
 
 class _Signal:
     def emit(self, *args, **kwargs):
         pass
 
+    def connect(self, *args, **kwargs):
+        pass
+
+    def disconnect(self, *args, **kwargs):
+        pass
+
 def pyqtSignal(*args, **kwargs):
     return _Signal()
 
+class QTimer(QObject):
+    def __init__(self, *args, **kwargs):
+        self.timeout = _Signal()
+
+    def setSingleShot(self, single_shot):
+        pass
+
+    def start(self, *args):
+        pass
+
+    def stop(self):
+        pass
+
+class QCoreApplication:
+    @staticmethod
+    def instance():
+        return None
+
 qtcore.QObject = QObject
 qtcore.pyqtSignal = pyqtSignal
+qtcore.QTimer = QTimer
+qtcore.QCoreApplication = QCoreApplication
 
 pyqt6 = types.ModuleType("PyQt6")
 pyqt6.QtCore = qtcore
 sys.modules["PyQt6"] = pyqt6
 sys.modules["PyQt6.QtCore"] = qtcore
 
-# Dynamically import SmartCache without triggering package imports
+# Dynamically import the cache module without triggering package imports
 spec = importlib.util.spec_from_file_location(
     "smart_cache_module", Path(__file__).resolve().parent / "optimizations" / "smart_cache.py"
 )
 smart_cache = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(smart_cache)
-SmartCache = smart_cache.SmartCache
+AdvancedSmartCache = smart_cache.AdvancedSmartCache
 
 
 def test_thread_safe_operations():
-    cache = SmartCache(max_size_mb=1)
+    cache = AdvancedSmartCache(max_size_mb=1)
     exceptions = []
 
     def worker(thread_id):
@@ -1,6 +1,6 @@
 # UI Components Package
 from .design_tokens import DesignTokens
-from .modern_components import ModernButton, ModernCard, ModernProgressBar, ModernSidebar, LoadingIndicator, ModernTable
+from .modern_components import ModernButton, ModernCard, ModernProgressBar, ModernSidebar, LoadingIndicator, ModernTable, ModernTableModel
 from .style_manager import StyleSheetManager
 from .performance import AsyncTaskManager
 from optimizations.smart_cache import SmartCache
@@ -13,6 +13,7 @@ __all__ = [
     'ModernSidebar',
     'LoadingIndicator',
     'ModernTable',
+    'ModernTableModel',
     'StyleSheetManager',
     'SmartCache',
     'AsyncTaskManager'
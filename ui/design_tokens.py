@@ -2,72 +2,79 @@
 Design Tokens - Centralized design system
 ========================================
 """
-from dataclasses import dataclass
+from typing import NamedTuple
 
-@dataclass
-class DesignTokens:
-    """Centralized design tokens for consistent styling"""
+class _Tokens(NamedTuple):
+    """Centralized design tokens for consistent styling
+    
+    A frozen record: attribute reads are C-level tuple lookups and the
+    values can't be reassigned at runtime.
+    """
     
     # Colors
-    PRIMARY = "#3b82f6"
-    PRIMARY_HOVER = "#2563eb"
-    SECONDARY = "#64748b"
-    SUCCESS = "#10b981"
-    WARNING = "#f59e0b"
-    DANGER = "#ef4444"
+    PRIMARY: str = "#3b82f6"
+    PRIMARY_HOVER: str = "#2563eb"
+    SECONDARY: str = "#64748b"
+    SUCCESS: str = "#10b981"
+    WARNING: str = "#f59e0b"
+    DANGER: str = "#ef4444"
     
     # Background
-    BG_PRIMARY = "#ffffff"
-    BG_SECONDARY = "#f8fafc"
-    BG_TERTIARY = "#f1f5f9"
-    BG_DARK = "#1e293b"
+    BG_PRIMARY: str = "#ffffff"
+    BG_SECONDARY: str = "#f8fafc"
+    BG_TERTIARY: str = "#f1f5f9"
+    BG_DARK: str = "#1e293b"
     
     # Text
-    TEXT_PRIMARY = "#1e293b"
-    TEXT_SECONDARY = "#64748b"
-    TEXT_MUTED = "#94a3b8"
-    TEXT_WHITE = "#ffffff"
+    TEXT_PRIMARY: str = "#1e293b"
+    TEXT_SECONDARY: str = "#64748b"
+    TEXT_MUTED: str = "#94a3b8"
+    TEXT_WHITE: str = "#ffffff"
     
     # Spacing
-    SPACE_XS = 4
-    SPACE_SM = 8
-    SPACE_MD = 16
-    SPACE_LG = 24
-    SPACE_XL = 32
-    SPACE_2XL = 48
+    SPACE_XS: int = 4
+    SPACE_SM: int = 8
+    SPACE_MD: int = 16
+    SPACE_LG: int = 24
+    SPACE_XL: int = 32
+    SPACE_2XL: int = 48
     
     # Borders
-    BORDER_RADIUS = 8
-    BORDER_RADIUS_SM = 4
-    BORDER_RADIUS_LG = 12
-    BORDER_WIDTH = 1
+    BORDER_RADIUS: int = 8
+    BORDER_RADIUS_SM: int = 4
+    BORDER_RADIUS_LG: int = 12
+    BORDER_WIDTH: int = 1
     
     # Shadows
-    SHADOW_SM = "0 1px 2px 0 rgba(0, 0, 0, 0.05)"
-    SHADOW_MD = "0 4px 6px -1px rgba(0, 0, 0, 0.1)"
-    SHADOW_LG = "0 10px 15px -3px rgba(0, 0, 0, 0.1)"
+    SHADOW_SM: str = "0 1px 2px 0 rgba(0, 0, 0, 0.05)"
+    SHADOW_MD: str = "0 4px 6px -1px rgba(0, 0, 0, 0.1)"
+    SHADOW_LG: str = "0 10px 15px -3px rgba(0, 0, 0, 0.1)"
+    SHADOW_BORDER: str = "#e2e8f0"  # Bottom edge used to suggest elevation in QSS
     
     # Typography
-    FONT_SIZE_XS = 10
-    FONT_SIZE_SM = 12
-    FONT_SIZE_MD = 14
-    FONT_SIZE_LG = 16
-    FONT_SIZE_XL = 18
-    FONT_SIZE_2XL = 20
+    FONT_SIZE_XS: int = 10
+    FONT_SIZE_SM: int = 12
+    FONT_SIZE_MD: int = 14
+    FONT_SIZE_LG: int = 16
+    FONT_SIZE_XL: int = 18
+    FONT_SIZE_2XL: int = 20
     
     # Layout
-    SIDEBAR_WIDTH_COLLAPSED = 60
-    SIDEBAR_WIDTH_COMPACT = 200
-    SIDEBAR_WIDTH_FULL = 280
-    HEADER_HEIGHT = 64
-    FOOTER_HEIGHT = 48
+    SIDEBAR_WIDTH_COLLAPSED: int = 60
+    SIDEBAR_WIDTH_COMPACT: int = 200
+    SIDEBAR_WIDTH_FULL: int = 280
+    HEADER_HEIGHT: int = 64
+    FOOTER_HEIGHT: int = 48
     
     # Animation
-    ANIMATION_FAST = 150
-    ANIMATION_NORMAL = 300
-    ANIMATION_SLOW = 500
+    ANIMATION_FAST: int = 150
+    ANIMATION_NORMAL: int = 300
+    ANIMATION_SLOW: int = 500
     
     # Z-Index
-    Z_DROPDOWN = 1000
-    Z_MODAL = 2000
-    Z_TOOLTIP = 3000
+    Z_DROPDOWN: int = 1000
+    Z_MODAL: int = 2000
+    Z_TOOLTIP: int = 3000
+
+# Shared token instance used as DesignTokens.PRIMARY etc.
+DesignTokens = _Tokens()
@@ -6,10 +6,12 @@ Quick diagnostic checks for CLI path, version, permissions, ADB, qemu-img.
 Provides results and fix suggestions.
 """
 
+import asyncio
 import os
 import subprocess
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
@@ -18,6 +20,91 @@ from PyQt6.QtCore import QObject, QThread, pyqtSignal
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTextEdit, QProgressBar
 
 
+# Wall-clock budget shared by all checks; checks still running past it are
+# reported as warnings instead of keeping the dialog waiting.
+DIAGNOSTICS_BUDGET_SECONDS = 15
+
+
+def _read_pe_version(path: str) -> Optional[str]:
+    """Read the file version resource of a Windows executable as "a.b.c.d"
+
+    Returns None when the platform is not Windows or the executable carries
+    no version resource, so callers can fall back to launching it.
+    """
+    if sys.platform != "win32":
+        return None
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class VS_FIXEDFILEINFO(ctypes.Structure):
+            _fields_ = [
+                ("dwSignature", wintypes.DWORD),
+                ("dwStrucVersion", wintypes.DWORD),
+                ("dwFileVersionMS", wintypes.DWORD),
+                ("dwFileVersionLS", wintypes.DWORD),
+                ("dwProductVersionMS", wintypes.DWORD),
+                ("dwProductVersionLS", wintypes.DWORD),
+                ("dwFileFlagsMask", wintypes.DWORD),
+                ("dwFileFlags", wintypes.DWORD),
+                ("dwFileOS", wintypes.DWORD),
+                ("dwFileType", wintypes.DWORD),
+                ("dwFileSubtype", wintypes.DWORD),
+                ("dwFileDateMS", wintypes.DWORD),
+                ("dwFileDateLS", wintypes.DWORD),
+            ]
+
+        version_dll = ctypes.windll.version
+        size = version_dll.GetFileVersionInfoSizeW(path, None)
+        if not size:
+            return None
+        buffer = ctypes.create_string_buffer(size)
+        if not version_dll.GetFileVersionInfoW(path, 0, size, buffer):
+            return None
+
+        value = ctypes.c_void_p()
+        length = wintypes.UINT()
+        if not version_dll.VerQueryValueW(buffer, "\\", ctypes.byref(value), ctypes.byref(length)):
+            return None
+        if length.value < ctypes.sizeof(VS_FIXEDFILEINFO):
+            return None
+
+        info = VS_FIXEDFILEINFO.from_address(value.value)
+        return "{}.{}.{}.{}".format(
+            info.dwFileVersionMS >> 16, info.dwFileVersionMS & 0xFFFF,
+            info.dwFileVersionLS >> 16, info.dwFileVersionLS & 0xFFFF,
+        )
+    except Exception:
+        return None
+
+
+def _total_physical_memory() -> int:
+    """Return total physical memory in bytes without psutil"""
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", wintypes.DWORD),
+                ("dwMemoryLoad", wintypes.DWORD),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        stat = MEMORYSTATUSEX()
+        stat.dwLength = ctypes.sizeof(stat)
+        if not ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(stat)):
+            raise ctypes.WinError()
+        return stat.ullTotalPhys
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+
 class DiagnosticStatus(Enum):
     """Diagnostic check status"""
     PASS = "pass"
@@ -36,339 +123,404 @@ class DiagnosticResult:
     fix_suggestion: str = ""
 
 
-class DiagnosticsWorker(QThread):
-    """Background worker for diagnostic checks"""
-    
-    progress_updated = pyqtSignal(int, str)  # progress, current_check
-    check_completed = pyqtSignal(DiagnosticResult)
-    all_completed = pyqtSignal(list)  # List[DiagnosticResult]
-    
-    def __init__(self):
-        super().__init__()
-        self.results = []
-        
-    def run(self):
-        """Run all diagnostic checks"""
-        checks = [
-            ("MuMu Manager Executable", self._check_mumu_executable),
-            ("MuMu Manager Version", self._check_mumu_version),
-            ("Process Permissions", self._check_permissions),
-            ("ADB Installation", self._check_adb),
-            ("QEMU Tools", self._check_qemu_img),
-            ("System Resources", self._check_system_resources),
-            ("Network Connectivity", self._check_network),
-        ]
-        
-        total_checks = len(checks)
-        
-        for i, (name, check_func) in enumerate(checks):
-            self.progress_updated.emit(int((i / total_checks) * 100), name)
-            
-            try:
-                result = check_func()
-                self.results.append(result)
-                self.check_completed.emit(result)
-            except Exception as e:
-                error_result = DiagnosticResult(
-                    name=name,
-                    status=DiagnosticStatus.FAIL,
-                    message=f"Check failed: {str(e)}",
-                    fix_suggestion="Contact support if this error persists."
-                )
-                self.results.append(error_result)
-                self.check_completed.emit(error_result)
-                
-        self.progress_updated.emit(100, "Diagnostics Complete")
-        self.all_completed.emit(self.results)
-        
-    def _check_mumu_executable(self) -> DiagnosticResult:
-        """Check if MuMu Manager executable exists and is accessible"""
-        possible_paths = [
-            r"C:\Program Files\Netease\MuMuPlayerGlobal-12.0\shell\MuMuManager.exe",
-            r"C:\Program Files\Netease\MuMuPlayer-12.0\shell\MuMuManager.exe",
-            r"C:\Program Files (x86)\Netease\MuMuPlayerGlobal-12.0\shell\MuMuManager.exe",
-            r"C:\Program Files (x86)\Netease\MuMuPlayer-12.0\shell\MuMuManager.exe"
-        ]
-        
-        found_paths = []
-        for path in possible_paths:
-            if os.path.isfile(path):
-                found_paths.append(path)
-                
-        if found_paths:
-            primary_path = found_paths[0]
-            try:
-                # Test if executable is accessible
-                result = subprocess.run([primary_path, "--help"], 
-                                      capture_output=True, timeout=10)
-                return DiagnosticResult(
-                    name="MuMu Manager Executable",
-                    status=DiagnosticStatus.PASS,
-                    message=f"Found and accessible: {primary_path}",
-                    details=f"Found {len(found_paths)} installation(s): {', '.join(found_paths)}"
-                )
-            except Exception as e:
-                return DiagnosticResult(
-                    name="MuMu Manager Executable",
-                    status=DiagnosticStatus.WARNING,
-                    message=f"Found but not accessible: {primary_path}",
-                    details=f"Error: {e}",
-                    fix_suggestion="Check if MuMu Manager is properly installed and not corrupted."
-                )
-        else:
+# Checks are plain module-level functions, run concurrently on a thread pool
+def _run_single_check(name: str, check_func) -> DiagnosticResult:
+    """Run one check, converting unexpected errors into a failed result"""
+    try:
+        return check_func()
+    except Exception as e:
+        return DiagnosticResult(
+            name=name,
+            status=DiagnosticStatus.FAIL,
+            message=f"Check failed: {str(e)}",
+            fix_suggestion="Contact support if this error persists."
+        )
+
+
+def _check_mumu_executable() -> DiagnosticResult:
+    """Check if MuMu Manager executable exists and is accessible"""
+    possible_paths = [
+        r"C:\Program Files\Netease\MuMuPlayerGlobal-12.0\shell\MuMuManager.exe",
+        r"C:\Program Files\Netease\MuMuPlayer-12.0\shell\MuMuManager.exe",
+        r"C:\Program Files (x86)\Netease\MuMuPlayerGlobal-12.0\shell\MuMuManager.exe",
+        r"C:\Program Files (x86)\Netease\MuMuPlayer-12.0\shell\MuMuManager.exe"
+    ]
+
+    found_paths = []
+    for path in possible_paths:
+        if os.path.isfile(path):
+            found_paths.append(path)
+
+    if found_paths:
+        primary_path = found_paths[0]
+        try:
+            # Test if executable is accessible
+            result = subprocess.run([primary_path, "--help"], 
+                                  capture_output=True, timeout=10)
             return DiagnosticResult(
                 name="MuMu Manager Executable",
-                status=DiagnosticStatus.FAIL,
-                message="MuMu Manager executable not found",
-                fix_suggestion="Install MuMu Player from the official website: https://www.mumuplayer.com/"
+                status=DiagnosticStatus.PASS,
+                message=f"Found and accessible: {primary_path}",
+                details=f"Found {len(found_paths)} installation(s): {', '.join(found_paths)}"
             )
-            
-    def _check_mumu_version(self) -> DiagnosticResult:
-        """Check MuMu Manager version"""
-        # Find executable first
-        possible_paths = [
-            r"C:\Program Files\Netease\MuMuPlayerGlobal-12.0\shell\MuMuManager.exe",
-            r"C:\Program Files\Netease\MuMuPlayer-12.0\shell\MuMuManager.exe",
-            r"C:\Program Files (x86)\Netease\MuMuPlayerGlobal-12.0\shell\MuMuManager.exe",
-            r"C:\Program Files (x86)\Netease\MuMuPlayer-12.0\shell\MuMuManager.exe"
-        ]
-        
-        executable_path = None
-        for path in possible_paths:
-            if os.path.isfile(path):
-                executable_path = path
-                break
-                
-        if not executable_path:
+        except Exception as e:
+            return DiagnosticResult(
+                name="MuMu Manager Executable",
+                status=DiagnosticStatus.WARNING,
+                message=f"Found but not accessible: {primary_path}",
+                details=f"Error: {e}",
+                fix_suggestion="Check if MuMu Manager is properly installed and not corrupted."
+            )
+    else:
+        return DiagnosticResult(
+            name="MuMu Manager Executable",
+            status=DiagnosticStatus.FAIL,
+            message="MuMu Manager executable not found",
+            fix_suggestion="Install MuMu Player from the official website: https://www.mumuplayer.com/"
+        )
+
+def _check_mumu_version() -> DiagnosticResult:
+    """Check MuMu Manager version"""
+    # Find executable first
+    possible_paths = [
+        r"C:\Program Files\Netease\MuMuPlayerGlobal-12.0\shell\MuMuManager.exe",
+        r"C:\Program Files\Netease\MuMuPlayer-12.0\shell\MuMuManager.exe",
+        r"C:\Program Files (x86)\Netease\MuMuPlayerGlobal-12.0\shell\MuMuManager.exe",
+        r"C:\Program Files (x86)\Netease\MuMuPlayer-12.0\shell\MuMuManager.exe"
+    ]
+
+    executable_path = None
+    for path in possible_paths:
+        if os.path.isfile(path):
+            executable_path = path
+            break
+
+    if not executable_path:
+        return DiagnosticResult(
+            name="MuMu Manager Version",
+            status=DiagnosticStatus.FAIL,
+            message="Cannot check version - executable not found",
+            fix_suggestion="Install MuMu Player first"
+        )
+
+    # Read the embedded version resource instead of launching the executable
+    pe_version = _read_pe_version(executable_path)
+    if pe_version:
+        return DiagnosticResult(
+            name="MuMu Manager Version",
+            status=DiagnosticStatus.PASS,
+            message="Version check successful",
+            details=f"MuMuManager {pe_version}"
+        )
+
+    try:
+        result = subprocess.run([executable_path, "--version"], 
+                              capture_output=True, text=True, timeout=10)
+        if result.returncode == 0:
+            version_info = result.stdout.strip()
             return DiagnosticResult(
                 name="MuMu Manager Version",
-                status=DiagnosticStatus.FAIL,
-                message="Cannot check version - executable not found",
-                fix_suggestion="Install MuMu Player first"
+                status=DiagnosticStatus.PASS,
+                message=f"Version check successful",
+                details=version_info or "Version information available"
             )
-            
-        try:
-            result = subprocess.run([executable_path, "--version"], 
-                                  capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                version_info = result.stdout.strip()
-                return DiagnosticResult(
-                    name="MuMu Manager Version",
-                    status=DiagnosticStatus.PASS,
-                    message=f"Version check successful",
-                    details=version_info or "Version information available"
-                )
-            else:
-                return DiagnosticResult(
-                    name="MuMu Manager Version",
-                    status=DiagnosticStatus.WARNING,
-                    message="Version check returned error",
-                    details=f"Return code: {result.returncode}, Error: {result.stderr}",
-                    fix_suggestion="Try reinstalling MuMu Player"
-                )
-        except subprocess.TimeoutExpired:
+        else:
             return DiagnosticResult(
                 name="MuMu Manager Version",
                 status=DiagnosticStatus.WARNING,
-                message="Version check timed out",
-                fix_suggestion="MuMu Manager may be slow to respond. Try again later."
+                message="Version check returned error",
+                details=f"Return code: {result.returncode}, Error: {result.stderr}",
+                fix_suggestion="Try reinstalling MuMu Player"
             )
-        except Exception as e:
+    except subprocess.TimeoutExpired:
+        return DiagnosticResult(
+            name="MuMu Manager Version",
+            status=DiagnosticStatus.WARNING,
+            message="Version check timed out",
+            fix_suggestion="MuMu Manager may be slow to respond. Try again later."
+        )
+    except Exception as e:
+        return DiagnosticResult(
+            name="MuMu Manager Version",
+            status=DiagnosticStatus.FAIL,
+            message=f"Version check failed: {str(e)}",
+            fix_suggestion="Check if MuMu Manager is properly installed"
+        )
+
+def _check_permissions() -> DiagnosticResult:
+    """Check if running with appropriate permissions"""
+    try:
+        import ctypes
+        is_admin = ctypes.windll.shell32.IsUserAnAdmin()
+
+        if is_admin:
             return DiagnosticResult(
-                name="MuMu Manager Version",
-                status=DiagnosticStatus.FAIL,
-                message=f"Version check failed: {str(e)}",
-                fix_suggestion="Check if MuMu Manager is properly installed"
+                name="Process Permissions",
+                status=DiagnosticStatus.PASS,
+                message="Running with administrator privileges",
+                details="Full system access available"
             )
-            
-    def _check_permissions(self) -> DiagnosticResult:
-        """Check if running with appropriate permissions"""
+        else:
+            return DiagnosticResult(
+                name="Process Permissions",
+                status=DiagnosticStatus.WARNING,
+                message="Not running as administrator",
+                details="Some operations may require elevated permissions",
+                fix_suggestion="Right-click the application and 'Run as administrator' if you encounter permission issues"
+            )
+    except Exception:
+        return DiagnosticResult(
+            name="Process Permissions",
+            status=DiagnosticStatus.UNKNOWN,
+            message="Could not determine permission level",
+            fix_suggestion="If you encounter permission errors, try running as administrator"
+        )
+
+def _check_adb() -> DiagnosticResult:
+    """Check ADB installation and accessibility"""
+    # Check if adb is in PATH
+    adb_path = shutil.which("adb")
+
+    if adb_path:
         try:
-            import ctypes
-            is_admin = ctypes.windll.shell32.IsUserAnAdmin()
-            
-            if is_admin:
+            result = subprocess.run(["adb", "version"], 
+                                  capture_output=True, text=True, timeout=10)
+            if result.returncode == 0:
+                version_info = result.stdout.strip().split('\n')[0] if result.stdout else "Unknown version"
                 return DiagnosticResult(
-                    name="Process Permissions",
+                    name="ADB Installation",
                     status=DiagnosticStatus.PASS,
-                    message="Running with administrator privileges",
-                    details="Full system access available"
+                    message=f"ADB found and working: {adb_path}",
+                    details=version_info
                 )
             else:
-                return DiagnosticResult(
-                    name="Process Permissions",
-                    status=DiagnosticStatus.WARNING,
-                    message="Not running as administrator",
-                    details="Some operations may require elevated permissions",
-                    fix_suggestion="Right-click the application and 'Run as administrator' if you encounter permission issues"
-                )
-        except Exception:
-            return DiagnosticResult(
-                name="Process Permissions",
-                status=DiagnosticStatus.UNKNOWN,
-                message="Could not determine permission level",
-                fix_suggestion="If you encounter permission errors, try running as administrator"
-            )
-            
-    def _check_adb(self) -> DiagnosticResult:
-        """Check ADB installation and accessibility"""
-        # Check if adb is in PATH
-        adb_path = shutil.which("adb")
-        
-        if adb_path:
-            try:
-                result = subprocess.run(["adb", "version"], 
-                                      capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    version_info = result.stdout.strip().split('\n')[0] if result.stdout else "Unknown version"
-                    return DiagnosticResult(
-                        name="ADB Installation",
-                        status=DiagnosticStatus.PASS,
-                        message=f"ADB found and working: {adb_path}",
-                        details=version_info
-                    )
-                else:
-                    return DiagnosticResult(
-                        name="ADB Installation",
-                        status=DiagnosticStatus.WARNING,
-                        message=f"ADB found but not working properly: {adb_path}",
-                        details=f"Error: {result.stderr}",
-                        fix_suggestion="Reinstall Android SDK Platform Tools"
-                    )
-            except Exception as e:
                 return DiagnosticResult(
                     name="ADB Installation",
                     status=DiagnosticStatus.WARNING,
-                    message=f"ADB found but failed to execute: {adb_path}",
-                    details=f"Error: {e}",
-                    fix_suggestion="Check ADB installation and permissions"
+                    message=f"ADB found but not working properly: {adb_path}",
+                    details=f"Error: {result.stderr}",
+                    fix_suggestion="Reinstall Android SDK Platform Tools"
                 )
-        else:
+        except Exception as e:
             return DiagnosticResult(
                 name="ADB Installation",
-                status=DiagnosticStatus.FAIL,
-                message="ADB not found in system PATH",
-                fix_suggestion="Install Android SDK Platform Tools and add to PATH, or use MuMu's built-in ADB"
+                status=DiagnosticStatus.WARNING,
+                message=f"ADB found but failed to execute: {adb_path}",
+                details=f"Error: {e}",
+                fix_suggestion="Check ADB installation and permissions"
             )
-            
-    def _check_qemu_img(self) -> DiagnosticResult:
-        """Check for QEMU tools (for disk image operations)"""
-        qemu_img_path = shutil.which("qemu-img")
-        
-        if qemu_img_path:
-            try:
-                result = subprocess.run(["qemu-img", "--version"], 
-                                      capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    version_info = result.stdout.strip().split('\n')[0] if result.stdout else "Unknown version"
-                    return DiagnosticResult(
-                        name="QEMU Tools",
-                        status=DiagnosticStatus.PASS,
-                        message=f"QEMU tools found: {qemu_img_path}",
-                        details=version_info
-                    )
-                else:
-                    return DiagnosticResult(
-                        name="QEMU Tools",
-                        status=DiagnosticStatus.WARNING,
-                        message="QEMU tools found but not working",
-                        fix_suggestion="Reinstall QEMU or check installation"
-                    )
-            except Exception:
+    else:
+        return DiagnosticResult(
+            name="ADB Installation",
+            status=DiagnosticStatus.FAIL,
+            message="ADB not found in system PATH",
+            fix_suggestion="Install Android SDK Platform Tools and add to PATH, or use MuMu's built-in ADB"
+        )
+
+def _check_qemu_img() -> DiagnosticResult:
+    """Check for QEMU tools (for disk image operations)"""
+    qemu_img_path = shutil.which("qemu-img")
+
+    if qemu_img_path:
+        try:
+            result = subprocess.run(["qemu-img", "--version"], 
+                                  capture_output=True, text=True, timeout=10)
+            if result.returncode == 0:
+                version_info = result.stdout.strip().split('\n')[0] if result.stdout else "Unknown version"
+                return DiagnosticResult(
+                    name="QEMU Tools",
+                    status=DiagnosticStatus.PASS,
+                    message=f"QEMU tools found: {qemu_img_path}",
+                    details=version_info
+                )
+            else:
                 return DiagnosticResult(
                     name="QEMU Tools",
                     status=DiagnosticStatus.WARNING,
-                    message="QEMU tools found but failed to execute",
-                    fix_suggestion="Check QEMU installation"
+                    message="QEMU tools found but not working",
+                    fix_suggestion="Reinstall QEMU or check installation"
                 )
-        else:
+        except Exception:
             return DiagnosticResult(
                 name="QEMU Tools",
                 status=DiagnosticStatus.WARNING,
-                message="QEMU tools not found",
-                details="Optional for advanced disk operations",
-                fix_suggestion="Install QEMU if you need advanced disk image features"
+                message="QEMU tools found but failed to execute",
+                fix_suggestion="Check QEMU installation"
             )
-            
-    def _check_system_resources(self) -> DiagnosticResult:
-        """Check system resources (RAM, disk space)"""
-        try:
-            import psutil
-            
-            # Check RAM
-            memory = psutil.virtual_memory()
-            memory_gb = memory.total / (1024**3)
-            
-            # Check disk space on system drive
-            disk = psutil.disk_usage('C:\\' if sys.platform == 'win32' else '/')
-            free_gb = disk.free / (1024**3)
-            
-            warnings = []
-            if memory_gb < 4:
-                warnings.append(f"Low RAM: {memory_gb:.1f}GB (recommend 8GB+)")
-            if free_gb < 10:
-                warnings.append(f"Low disk space: {free_gb:.1f}GB free (recommend 20GB+)")
-                
-            if warnings:
-                return DiagnosticResult(
-                    name="System Resources",
-                    status=DiagnosticStatus.WARNING,
-                    message="System resources may be limited",
-                    details="; ".join(warnings),
-                    fix_suggestion="Consider upgrading hardware or freeing up resources"
-                )
-            else:
-                return DiagnosticResult(
-                    name="System Resources",
-                    status=DiagnosticStatus.PASS,
-                    message=f"Adequate resources: {memory_gb:.1f}GB RAM, {free_gb:.1f}GB free disk"
-                )
-                
-        except ImportError:
+    else:
+        return DiagnosticResult(
+            name="QEMU Tools",
+            status=DiagnosticStatus.WARNING,
+            message="QEMU tools not found",
+            details="Optional for advanced disk operations",
+            fix_suggestion="Install QEMU if you need advanced disk image features"
+        )
+
+def _check_system_resources() -> DiagnosticResult:
+    """Check system resources (RAM, disk space)"""
+    try:
+        # Check RAM
+        memory_gb = _total_physical_memory() / (1024**3)
+
+        # Check disk space on system drive (GetDiskFreeSpaceExW on Windows)
+        disk = shutil.disk_usage('C:\\' if sys.platform == 'win32' else '/')
+        free_gb = disk.free / (1024**3)
+
+        warnings = []
+        if memory_gb < 4:
+            warnings.append(f"Low RAM: {memory_gb:.1f}GB (recommend 8GB+)")
+        if free_gb < 10:
+            warnings.append(f"Low disk space: {free_gb:.1f}GB free (recommend 20GB+)")
+
+        if warnings:
             return DiagnosticResult(
                 name="System Resources",
-                status=DiagnosticStatus.UNKNOWN,
-                message="Cannot check system resources (psutil not available)",
-                fix_suggestion="Install psutil package for resource monitoring"
+                status=DiagnosticStatus.WARNING,
+                message="System resources may be limited",
+                details="; ".join(warnings),
+                fix_suggestion="Consider upgrading hardware or freeing up resources"
             )
-        except Exception as e:
+        else:
             return DiagnosticResult(
                 name="System Resources",
-                status=DiagnosticStatus.UNKNOWN,
-                message=f"Error checking resources: {e}"
+                status=DiagnosticStatus.PASS,
+                message=f"Adequate resources: {memory_gb:.1f}GB RAM, {free_gb:.1f}GB free disk"
             )
-            
-    def _check_network(self) -> DiagnosticResult:
-        """Check network connectivity"""
-        try:
-            result = subprocess.run(["ping", "-n" if sys.platform == "win32" else "-c", "1", "8.8.8.8"], 
-                                  capture_output=True, timeout=5)
-            if result.returncode == 0:
-                return DiagnosticResult(
-                    name="Network Connectivity",
-                    status=DiagnosticStatus.PASS,
-                    message="Network connectivity working"
-                )
-            else:
-                return DiagnosticResult(
-                    name="Network Connectivity",
-                    status=DiagnosticStatus.WARNING,
-                    message="Network connectivity issues detected",
-                    fix_suggestion="Check internet connection and firewall settings"
-                )
-        except subprocess.TimeoutExpired:
+
+    except Exception as e:
+        return DiagnosticResult(
+            name="System Resources",
+            status=DiagnosticStatus.UNKNOWN,
+            message=f"Error checking resources: {e}"
+        )
+
+def _check_network() -> DiagnosticResult:
+    """Check network connectivity"""
+    try:
+        result = subprocess.run(["ping", "-n" if sys.platform == "win32" else "-c", "1", "8.8.8.8"], 
+                              capture_output=True, timeout=5)
+        if result.returncode == 0:
+            return DiagnosticResult(
+                name="Network Connectivity",
+                status=DiagnosticStatus.PASS,
+                message="Network connectivity working"
+            )
+        else:
             return DiagnosticResult(
                 name="Network Connectivity",
                 status=DiagnosticStatus.WARNING,
-                message="Network check timed out",
-                fix_suggestion="Check internet connection"
+                message="Network connectivity issues detected",
+                fix_suggestion="Check internet connection and firewall settings"
             )
+    except subprocess.TimeoutExpired:
+        return DiagnosticResult(
+            name="Network Connectivity",
+            status=DiagnosticStatus.WARNING,
+            message="Network check timed out",
+            fix_suggestion="Check internet connection"
+        )
+    except Exception as e:
+        return DiagnosticResult(
+            name="Network Connectivity",
+            status=DiagnosticStatus.UNKNOWN,
+            message=f"Could not test network: {e}"
+        )
+
+
+class DiagnosticsWorker(QThread):
+    """Background worker for diagnostic checks"""
+    
+    progress_updated = pyqtSignal(int, str)  # progress, current_check
+    check_completed = pyqtSignal(DiagnosticResult)
+    all_completed = pyqtSignal(list)  # List[DiagnosticResult]
+    
+    def __init__(self):
+        super().__init__()
+        self.results = []
+        
+    def run(self):
+        """Run all diagnostic checks"""
+        checks = [
+            ("MuMu Manager Executable", _check_mumu_executable),
+            ("MuMu Manager Version", _check_mumu_version),
+            ("Process Permissions", _check_permissions),
+            ("ADB Installation", _check_adb),
+            ("QEMU Tools", _check_qemu_img),
+            ("System Resources", _check_system_resources),
+            ("Network Connectivity", _check_network),
+        ]
+        
+        try:
+            asyncio.run(self._run_checks(checks))
+        except Exception as e:
+            self._record_result(DiagnosticResult(
+                name="Diagnostics",
+                status=DiagnosticStatus.FAIL,
+                message=f"Diagnostics run failed: {str(e)}",
+                fix_suggestion="Try running diagnostics again."
+            ))
+        finally:
+            # Always release the dialog, even if the event loop itself failed
+            self.progress_updated.emit(100, "Diagnostics Complete")
+            self.all_completed.emit(self.results)
+        
+    async def _run_checks(self, checks: List[Tuple[str, object]]):
+        """Run checks concurrently within the shared diagnostics budget"""
+        loop = asyncio.get_running_loop()
+        total_checks = len(checks)
+        # The checks are subprocess waits, I/O and ctypes calls, so threads
+        # are enough; no worker processes re-importing the application
+        executor = ThreadPoolExecutor(max_workers=total_checks,
+                                      thread_name_prefix="diagnostics")
+        try:
+            tasks = {
+                loop.run_in_executor(executor, _run_single_check, name, check_func): name
+                for name, check_func in checks
+            }
+            pending = set(tasks)
+            deadline = loop.time() + DIAGNOSTICS_BUDGET_SECONDS
+            
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    self._record_result(self._task_result(task, tasks[task]))
+                    self.progress_updated.emit(
+                        int((len(self.results) / total_checks) * 100), tasks[task]
+                    )
+                    
+            for task in pending:
+                task.cancel()
+                self._record_result(DiagnosticResult(
+                    name=tasks[task],
+                    status=DiagnosticStatus.WARNING,
+                    message=f"Exceeded {DIAGNOSTICS_BUDGET_SECONDS}s diagnostics budget",
+                    fix_suggestion="The check did not finish in time. Try running diagnostics again."
+                ))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            
+    @staticmethod
+    def _task_result(task: "asyncio.Future", name: str) -> DiagnosticResult:
+        """Result of a finished check task, or a FAIL result if it raised"""
+        try:
+            return task.result()
         except Exception as e:
             return DiagnosticResult(
-                name="Network Connectivity",
-                status=DiagnosticStatus.UNKNOWN,
-                message=f"Could not test network: {e}"
+                name=name,
+                status=DiagnosticStatus.FAIL,
+                message=f"Check failed: {str(e)}",
+                fix_suggestion="Contact support if this error persists."
             )
+            
+    def _record_result(self, result: DiagnosticResult):
+        """Store a finished check and notify listeners"""
+        self.results.append(result)
+        self.check_completed.emit(result)
 
 
 class DiagnosticsDialog(QDialog):
@@ -459,21 +611,21 @@ class DiagnosticsDialog(QDialog):
         color = status_colors[result.status]
         symbol = status_symbols[result.status]
         
-        html = f"""
-        <div style="margin: 10px 0; padding: 10px; border-left: 4px solid {color};">
-            <h3 style="margin: 0; color: {color};">{symbol} {result.name}</h3>
-            <p style="margin: 5px 0;"><strong>Status:</strong> {result.message}</p>
-        """
+        parts = [
+            f'<div style="margin: 10px 0; padding: 10px; border-left: 4px solid {color};">',
+            f'<h3 style="margin: 0; color: {color};">{symbol} {result.name}</h3>',
+            f'<p style="margin: 5px 0;"><strong>Status:</strong> {result.message}</p>',
+        ]
         
         if result.details:
-            html += f"<p style='margin: 5px 0;'><strong>Details:</strong> {result.details}</p>"
+            parts.append(f"<p style='margin: 5px 0;'><strong>Details:</strong> {result.details}</p>")
             
         if result.fix_suggestion:
-            html += f"<p style='margin: 5px 0; color: #2196F3;'><strong>Fix:</strong> {result.fix_suggestion}</p>"
+            parts.append(f"<p style='margin: 5px 0; color: #2196F3;'><strong>Fix:</strong> {result.fix_suggestion}</p>")
             
-        html += "</div>"
+        parts.append("</div>")
         
-        self.results_text.append(html)
+        self.results_text.append("".join(parts))
         
     def on_all_completed(self, results: List[DiagnosticResult]):
         """Handle all diagnostics completion"""
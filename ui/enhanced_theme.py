@@ -6,6 +6,7 @@ Integrates resource bundling, Windows accent detection, and theme management.
 """
 
 import os
+from string import Template
 from typing import Optional
 from PyQt6.QtCore import QObject, QSettings, pyqtSignal
 from PyQt6.QtWidgets import QApplication
@@ -15,114 +16,67 @@ from resources.resource_manager import get_resource_manager, load_qss
 from ui.accent_detection import get_accent_manager
 
 
-class EnhancedThemeManager(QObject):
-    """Enhanced theme manager with resource bundling and accent detection"""
-    
-    theme_changed = pyqtSignal(str)  # theme name
-    accent_changed = pyqtSignal(str)  # accent color
-    
-    def __init__(self):
-        super().__init__()
-        self.resource_manager = get_resource_manager()
-        self.accent_manager = get_accent_manager()
-        self.current_theme = "dark"
-        self.accent_enabled = True
-        
-        # Connect accent manager signals
-        self.accent_manager.theme_changed.connect(self._on_accent_theme_changed)
-        
-    def apply_theme(self, app: QApplication, theme_name: str = None, 
-                   enable_accent: bool = True):
-        """Apply theme to application"""
-        if theme_name:
-            self.current_theme = theme_name
-            
-        self.accent_enabled = enable_accent
-        
-        # Load base stylesheet
-        base_qss = self.resource_manager.load_stylesheet(self.current_theme)
-        if not base_qss:
-            # Fallback to built-in theme
-            base_qss = self._get_fallback_theme(self.current_theme)
-            
-        # Apply Windows accent if enabled
-        if self.accent_enabled:
-            final_qss = self.accent_manager.apply_accent_theme(base_qss)
-        else:
-            final_qss = base_qss
-            
-        # Apply to application
-        app.setStyleSheet(final_qss)
-        
-        # Apply palette for better integration
-        if self.current_theme == "dark":
-            app.setPalette(self._get_dark_palette())
-        else:
-            app.setPalette(self._get_light_palette())
-            
-        self.theme_changed.emit(self.current_theme)
-        
-    def set_theme(self, app: QApplication, theme_name: str):
-        """Set and apply new theme"""
-        self.apply_theme(app, theme_name, self.accent_enabled)
-        
-    def toggle_accent(self, app: QApplication, enabled: bool):
-        """Toggle Windows accent integration"""
-        self.accent_enabled = enabled
-        self.apply_theme(app, self.current_theme, enabled)
-        
-    def refresh_accent(self, app: QApplication):
-        """Refresh Windows accent color"""
-        if self.accent_enabled:
-            self.accent_manager.refresh_accent_color()
-            self.apply_theme(app, self.current_theme, True)
-            
-    def get_available_themes(self) -> list:
-        """Get list of available themes"""
-        themes = self.resource_manager.list_stylesheets()
-        # Add built-in themes if not found in resources
-        built_in = ["dark", "light"]
-        for theme in built_in:
-            if theme not in themes:
-                themes.append(theme)
-        return sorted(themes)
-        
-    def get_current_theme(self) -> str:
-        """Get current theme name"""
-        return self.current_theme
-        
-    def is_accent_enabled(self) -> bool:
-        """Check if Windows accent is enabled"""
-        return self.accent_enabled
-        
-    def save_settings(self, settings: QSettings):
-        """Save theme settings"""
-        settings.setValue("theme/name", self.current_theme)
-        settings.setValue("theme/accent_enabled", self.accent_enabled)
-        
-    def load_settings(self, settings: QSettings, app: QApplication):
-        """Load theme settings"""
-        theme_name = settings.value("theme/name", "dark")
-        accent_enabled = settings.value("theme/accent_enabled", True, type=bool)
-        
-        self.apply_theme(app, theme_name, accent_enabled)
-        
-    def _on_accent_theme_changed(self, qss: str):
-        """Handle accent theme changes"""
-        app = QApplication.instance()
-        if app:
-            app.setStyleSheet(qss)
-            
-    def _get_fallback_theme(self, theme_name: str) -> str:
-        """Get fallback theme if resource not found"""
-        if theme_name == "dark":
-            return self._get_dark_fallback()
-        else:
-            return self._get_light_fallback()
-            
-    def _get_dark_fallback(self) -> str:
-        """Built-in dark theme fallback"""
-        return """
+# Accent rules shared by the built-in themes; rendered together with the base
+# theme so fallback themes need no separate accent overlay pass.
+_ACCENT_QSS = """
+/* Accent Color */
+QPushButton[primary="true"] {
+    background-color: ${accent};
+    color: white;
+    border: 1px solid ${accent_dark};
+    padding: 8px 16px;
+    border-radius: 4px;
+    font-weight: bold;
+}
+
+QPushButton[primary="true"]:hover {
+    background-color: ${accent_hover};
+    border-color: ${accent_dark};
+}
+
+QPushButton[primary="true"]:pressed {
+    background-color: ${accent_pressed};
+}
+
+QTabBar::tab:selected {
+    border-bottom: 2px solid ${accent};
+}
+
+QLineEdit:focus {
+    border-color: ${accent};
+}
+
+QTableView::item:selected {
+    background-color: ${accent};
+}
+
+QCheckBox::indicator:checked {
+    background-color: ${accent};
+    border-color: ${accent};
+}
+
+QCheckBox::indicator:checked:hover {
+    background-color: ${accent_hover};
+}
+
+QScrollBar::handle:vertical:hover,
+QScrollBar::handle:horizontal:hover {
+    background-color: ${accent_light};
+}
+
+/* Status pill colors with accent */
+.status-pill-accent {
+    background-color: ${accent};
+    color: white;
+    border-radius: 12px;
+    padding: 4px 8px;
+    font-weight: bold;
+}
+"""
+
+# Built-in themes, with ${accent} marking the accent-colored rules
+_FALLBACK_QSS = {
+    "dark": """
 /* Built-in Dark Theme */
 QMainWindow {
     background-color: #2b2b2b;
@@ -181,7 +135,7 @@ QProgressBar {
 }
 
 QProgressBar::chunk {
-    background-color: #007acc;
+    background-color: ${accent};
     border-radius: 3px;
 }
 
@@ -190,11 +144,8 @@ QStatusBar {
     color: #ffffff;
     border-top: 1px solid #555555;
 }
-"""
-        
-    def _get_light_fallback(self) -> str:
-        """Built-in light theme fallback"""
-        return """
+""",
+    "light": """
 /* Built-in Light Theme */
 QMainWindow {
     background-color: #ffffff;
@@ -204,14 +155,14 @@ QMainWindow {
 QTableView {
     background-color: #ffffff;
     alternate-background-color: #f5f5f5;
-    selection-background-color: #0078d4;
+    selection-background-color: ${accent};
     gridline-color: #d0d0d0;
     color: #000000;
     border: 1px solid #d0d0d0;
 }
 
 QTableView::item:selected {
-    background-color: #0078d4;
+    background-color: ${accent};
     color: #ffffff;
 }
 
@@ -245,7 +196,7 @@ QProgressBar {
 }
 
 QProgressBar::chunk {
-    background-color: #0078d4;
+    background-color: ${accent};
     border-radius: 3px;
 }
 
@@ -254,8 +205,156 @@ QStatusBar {
     color: #000000;
     border-top: 1px solid #d0d0d0;
 }
-"""
+""",
+}
+
+# Templates compiled once at import, keyed by (theme, accent_enabled);
+# _render() only substitutes colors.
+_FALLBACK_TEMPLATES = {
+    (theme, with_accent): Template(qss + _ACCENT_QSS if with_accent else qss)
+    for theme, qss in _FALLBACK_QSS.items()
+    for with_accent in (False, True)
+}
 
+# Accent used by the built-in themes when Windows accent integration is off
+_DEFAULT_ACCENTS = {
+    "dark": "#007acc",
+    "light": "#0078d4",
+}
+
+
+def _render(theme: str, accent: str, with_accent: bool = True) -> str:
+    """Render a built-in theme with the given accent color"""
+    if theme != "dark":
+        theme = "light"
+    colors = get_accent_manager().detector.get_complementary_colors(accent)
+    return _FALLBACK_TEMPLATES[(theme, with_accent)].substitute(colors)
+
+
+class EnhancedThemeManager(QObject):
+    """Enhanced theme manager with resource bundling and accent detection"""
+    
+    theme_changed = pyqtSignal(str)  # theme name
+    accent_changed = pyqtSignal(str)  # accent color
+    
+    def __init__(self):
+        super().__init__()
+        self.resource_manager = get_resource_manager()
+        self.accent_manager = get_accent_manager()
+        self.current_theme = "dark"
+        self.accent_enabled = True
+        self._themes_cache: Optional[list] = None
+        self._last_applied_qss = ""
+        
+        # Connect accent manager signals
+        self.accent_manager.theme_changed.connect(self._on_accent_theme_changed)
+        
+    def apply_theme(self, app: QApplication, theme_name: str = None, 
+                   enable_accent: bool = True):
+        """Apply theme to application"""
+        if theme_name:
+            self.current_theme = theme_name
+            
+        self.accent_enabled = enable_accent
+        
+        # Load base stylesheet
+        base_qss = self.resource_manager.load_stylesheet(self.current_theme)
+        if not base_qss:
+            # Built-in theme already carries the accent rules, render in one pass
+            if self.accent_enabled:
+                final_qss = _render(self.current_theme,
+                                    self.accent_manager.get_current_accent())
+            else:
+                final_qss = self._get_fallback_theme(self.current_theme)
+        elif self.accent_enabled:
+            # Apply Windows accent
+            final_qss = self.accent_manager.apply_accent_theme(base_qss)
+        else:
+            final_qss = base_qss
+            
+        # Apply to application
+        self._set_stylesheet(app, final_qss)
+        
+        # Apply palette for better integration
+        if self.current_theme == "dark":
+            app.setPalette(self._get_dark_palette())
+        else:
+            app.setPalette(self._get_light_palette())
+            
+        self.theme_changed.emit(self.current_theme)
+        
+    def set_theme(self, app: QApplication, theme_name: str):
+        """Set and apply new theme"""
+        self.apply_theme(app, theme_name, self.accent_enabled)
+        
+    def toggle_accent(self, app: QApplication, enabled: bool):
+        """Toggle Windows accent integration"""
+        self.accent_enabled = enabled
+        self.apply_theme(app, self.current_theme, enabled)
+        
+    def refresh_accent(self, app: QApplication):
+        """Refresh Windows accent color"""
+        if self.accent_enabled:
+            self.accent_manager.refresh_accent_color()
+            self.apply_theme(app, self.current_theme, True)
+            
+    def get_available_themes(self) -> list:
+        """Get list of available themes"""
+        # Bundled stylesheets don't change at runtime, scan them only once
+        if self._themes_cache is None:
+            themes = self.resource_manager.list_stylesheets()
+            # Add built-in themes if not found in resources
+            built_in = ["dark", "light"]
+            for theme in built_in:
+                if theme not in themes:
+                    themes.append(theme)
+            self._themes_cache = sorted(themes)
+        return list(self._themes_cache)
+        
+    def invalidate_themes_cache(self):
+        """Force the next get_available_themes() to rescan stylesheets"""
+        self._themes_cache = None
+        
+    def get_current_theme(self) -> str:
+        """Get current theme name"""
+        return self.current_theme
+        
+    def is_accent_enabled(self) -> bool:
+        """Check if Windows accent is enabled"""
+        return self.accent_enabled
+        
+    def save_settings(self, settings: QSettings):
+        """Save theme settings"""
+        settings.setValue("theme/name", self.current_theme)
+        settings.setValue("theme/accent_enabled", self.accent_enabled)
+        
+    def load_settings(self, settings: QSettings, app: QApplication):
+        """Load theme settings"""
+        theme_name = settings.value("theme/name", "dark")
+        accent_enabled = settings.value("theme/accent_enabled", True, type=bool)
+        
+        self.apply_theme(app, theme_name, accent_enabled)
+        
+    def _on_accent_theme_changed(self, qss: str):
+        """Handle accent theme changes"""
+        app = QApplication.instance()
+        if app:
+            self._set_stylesheet(app, qss)
+            
+    def _set_stylesheet(self, app: QApplication, qss: str):
+        """Set application stylesheet, skipping the restyle if unchanged"""
+        # Qt restyles every widget on setStyleSheet even for an identical sheet;
+        # still re-apply if something else replaced the sheet in the meantime
+        if qss == self._last_applied_qss and app.styleSheet() == qss:
+            return
+        self._last_applied_qss = qss
+        app.setStyleSheet(qss)
+            
+    def _get_fallback_theme(self, theme_name: str) -> str:
+        """Get fallback theme if resource not found"""
+        accent = _DEFAULT_ACCENTS.get(theme_name, _DEFAULT_ACCENTS["light"])
+        return _render(theme_name, accent, with_accent=False)
+            
     def _get_dark_palette(self) -> QPalette:
         """Get dark color palette"""
         palette = QPalette()
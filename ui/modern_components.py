@@ -2,12 +2,55 @@
 Modern UI Components - Ready to use replacements
 ===============================================
 """
+import os
 from PyQt6.QtWidgets import *
 from PyQt6.QtCore import *
 from PyQt6.QtGui import *
-from typing import Optional, List
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Optional, List, Sequence
 from .design_tokens import DesignTokens
 from .style_manager import StyleSheetManager
+from resources.resource_manager import get_resource_manager
+
+# APP_REDUCED_MOTION=1 makes size changes instant instead of animated
+USE_ANIMATIONS = os.environ.get("APP_REDUCED_MOTION", "0") != "1"
+
+# Shared by every card shadow (QColor is implicitly shared)
+_SHADOW_COLOR = QColor(0, 0, 0, 25)
+_SPINNER_COLOR = QColor(DesignTokens.PRIMARY)
+
+# Icon size shared by every ModernButton
+_ICON_SIZE = QSize(16, 16)
+
+# Layout margins reused by every component instance
+_CARD_MARGINS = QMargins(
+    DesignTokens.SPACE_MD, DesignTokens.SPACE_MD,
+    DesignTokens.SPACE_MD, DesignTokens.SPACE_MD
+)
+_SIDEBAR_MARGINS = QMargins(
+    DesignTokens.SPACE_SM, DesignTokens.SPACE_MD,
+    DesignTokens.SPACE_SM, DesignTokens.SPACE_MD
+)
+_SIDEBAR_SECTION_MARGINS = QMargins(DesignTokens.SPACE_SM, 0, DesignTokens.SPACE_SM, 0)
+
+@lru_cache(maxsize=None)
+def _hand_cursor() -> QCursor:
+    """Get the shared pointing-hand cursor
+
+    Built on first use because a QCursor can't be created before the
+    QGuiApplication, which doesn't exist yet when this module is imported.
+    """
+    return QCursor(Qt.CursorShape.PointingHandCursor)
+
+@lru_cache(maxsize=128)
+def _icon(name: str) -> QIcon:
+    """Shared QIcon per name, so buttons also share its rasterized pixmaps"""
+    resource = f":/icons/{name}.svg"
+    if QFile.exists(resource):
+        return QIcon(resource)
+    # resources.qrc is not compiled in every build; use the icon file on disk
+    return QIcon(get_resource_manager().get_resource_path("icons", name))
 
 class ModernButton(QPushButton):
     """Modern button with design system integration"""
@@ -22,7 +65,6 @@ class ModernButton(QPushButton):
         self.setProperty("variant", variant)
         
         self.setup_style()
-        self.setup_animations()
         self.setup_cursor()
         
         if icon:
@@ -32,22 +74,20 @@ class ModernButton(QPushButton):
         """Apply design system styles"""
         # Update property for CSS selector
         self.setProperty("variant", self.variant)
-        self.setStyleSheet(StyleSheetManager.button(self.variant, self.size))
-    
-    def setup_animations(self):
-        """Setup hover animations"""
-        self.animation = QPropertyAnimation(self, b"geometry")
-        self.animation.setDuration(DesignTokens.ANIMATION_FAST)
-        self.animation.setEasingCurve(QEasingCurve.Type.OutCubic)
+        qss = StyleSheetManager.button(self.variant, self.size)
+        # Re-applying an identical sheet would still make Qt reparse it
+        if self.styleSheet() == qss:
+            return
+        self.setStyleSheet(qss)
     
     def setup_cursor(self):
         """Setup cursor"""
-        self.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.setCursor(_hand_cursor())
     
     def setup_icon(self, icon_name: str):
         """Add icon to button"""
-        # Placeholder for icon system
-        pass
+        self.setIcon(_icon(icon_name))
+        self.setIconSize(_ICON_SIZE)
 
 class ModernCard(QFrame):
     """Modern card component with shadow and animations"""
@@ -59,39 +99,24 @@ class ModernCard(QFrame):
         self.elevated = elevated
         
         self.setup_ui()
+        # Elevation is part of the card stylesheet; see setup_shadow() for a
+        # real (but costlier) drop shadow
         self.setup_style()
-        if elevated:
-            self.setup_shadow()
     
     def setup_ui(self):
         """Setup card UI"""
         self.layout = QVBoxLayout(self)
         self.layout.setSpacing(DesignTokens.SPACE_SM)
-        self.layout.setContentsMargins(
-            DesignTokens.SPACE_MD, DesignTokens.SPACE_MD,
-            DesignTokens.SPACE_MD, DesignTokens.SPACE_MD
-        )
+        self.layout.setContentsMargins(_CARD_MARGINS)
         
         if self.title:
             self.title_label = QLabel(self.title)
-            self.title_label.setStyleSheet(f"""
-            QLabel {{
-                font-size: {DesignTokens.FONT_SIZE_LG}px;
-                font-weight: 600;
-                color: {DesignTokens.TEXT_PRIMARY};
-                margin-bottom: {DesignTokens.SPACE_XS}px;
-            }}
-            """)
+            self.title_label.setProperty("role", "cardTitle")
             self.layout.addWidget(self.title_label)
         
         if self.subtitle:
             self.subtitle_label = QLabel(self.subtitle)
-            self.subtitle_label.setStyleSheet(f"""
-            QLabel {{
-                font-size: {DesignTokens.FONT_SIZE_SM}px;
-                color: {DesignTokens.TEXT_SECONDARY};
-            }}
-            """)
+            self.subtitle_label.setProperty("role", "cardSubtitle")
             self.layout.addWidget(self.subtitle_label)
     
     def setup_style(self):
@@ -99,10 +124,10 @@ class ModernCard(QFrame):
         self.setStyleSheet(StyleSheetManager.card(self.elevated))
     
     def setup_shadow(self):
-        """Add drop shadow effect"""
+        """Add drop shadow effect (renders the card offscreen on every repaint)"""
         shadow = QGraphicsDropShadowEffect()
         shadow.setBlurRadius(10)
-        shadow.setColor(QColor(0, 0, 0, 25))
+        shadow.setColor(_SHADOW_COLOR)
         shadow.setOffset(0, 2)
         self.setGraphicsEffect(shadow)
     
@@ -115,19 +140,27 @@ class ModernProgressBar(QProgressBar):
     
     def __init__(self):
         super().__init__()
+        # Value animation is created on the first setValueAnimated() call
+        self._animation = None
         self.setup_style()
-        self.setup_animation()
     
     def setup_style(self):
         """Apply modern styling"""
         self.setStyleSheet(StyleSheetManager.progress_bar())
         self.setTextVisible(True)
     
+    @property
+    def animation(self) -> QPropertyAnimation:
+        """Value animation, created on first access"""
+        if self._animation is None:
+            self.setup_animation()
+        return self._animation
+    
     def setup_animation(self):
         """Setup smooth value animations"""
-        self.animation = QPropertyAnimation(self, b"value")
-        self.animation.setDuration(DesignTokens.ANIMATION_NORMAL)
-        self.animation.setEasingCurve(QEasingCurve.Type.OutCubic)
+        self._animation = QPropertyAnimation(self, b"value")
+        self._animation.setDuration(DesignTokens.ANIMATION_NORMAL)
+        self._animation.setEasingCurve(QEasingCurve.Type.OutCubic)
     
     def setValueAnimated(self, value: int):
         """Set value with smooth animation"""
@@ -135,6 +168,58 @@ class ModernProgressBar(QProgressBar):
         self.animation.setEndValue(value)
         self.animation.start()
 
+class SpinnerWidget(QWidget):
+    """Rotating arc painted on a timer"""
+    
+    FRAME_INTERVAL_MS = 16
+    DEGREES_PER_FRAME = 6  # One revolution per ~second
+    
+    def __init__(self, size: int = 32, parent=None):
+        super().__init__(parent)
+        self._size = size
+        self._angle = 0
+        self._pen = QPen(_SPINNER_COLOR, max(2, size // 8))
+        self._pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.FRAME_INTERVAL_MS)
+        self._timer.timeout.connect(self._tick)
+        self.setFixedSize(size, size)
+    
+    def sizeHint(self) -> QSize:
+        return QSize(self._size, self._size)
+    
+    def start(self):
+        """Start rotating"""
+        self._timer.start()
+    
+    def stop(self):
+        """Stop rotating"""
+        self._timer.stop()
+    
+    def is_running(self) -> bool:
+        """Check if the spinner is rotating"""
+        return self._timer.isActive()
+    
+    @property
+    def angle(self) -> int:
+        """Current rotation in degrees"""
+        return self._angle
+    
+    def _tick(self):
+        self._angle = (self._angle + self.DEGREES_PER_FRAME) % 360
+        self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(self._pen)
+        painter.translate(self.rect().center())
+        painter.rotate(self._angle)
+        
+        radius = (self._size - self._pen.width()) / 2
+        # 270 degree arc; drawArc angles are in 1/16th of a degree
+        painter.drawArc(QRectF(-radius, -radius, radius * 2, radius * 2), 0, 270 * 16)
+
 class LoadingIndicator(QWidget):
     """Modern loading indicator"""
     
@@ -142,10 +227,8 @@ class LoadingIndicator(QWidget):
         super().__init__()
         self.message = message
         self.size = size
-        self.angle = 0
         
         self.setup_ui()
-        self.setup_animation()
     
     def setup_ui(self):
         """Setup loading UI"""
@@ -153,43 +236,101 @@ class LoadingIndicator(QWidget):
         layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.setSpacing(DesignTokens.SPACE_MD)
         
-        # Spinner placeholder (using label for now)
-        self.spinner = QLabel("⟳")
-        self.spinner.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.spinner.setStyleSheet(f"""
-        QLabel {{
-            font-size: {self.size}px;
-            color: {DesignTokens.PRIMARY};
-        }}
-        """)
-        layout.addWidget(self.spinner)
+        # Spinner
+        self.spinner = SpinnerWidget(self.size)
+        layout.addWidget(self.spinner, 0, Qt.AlignmentFlag.AlignCenter)
         
         # Message
         self.message_label = QLabel(self.message)
         self.message_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.message_label.setStyleSheet(f"""
-        QLabel {{
-            font-size: {DesignTokens.FONT_SIZE_MD}px;
-            color: {DesignTokens.TEXT_SECONDARY};
-        }}
-        """)
+        self.message_label.setProperty("role", "loadingMessage")
         layout.addWidget(self.message_label)
+        
+        self.setStyleSheet(StyleSheetManager.loading_indicator())
     
-    def setup_animation(self):
-        """Setup rotation animation"""
-        self.rotation_animation = QPropertyAnimation(self, b"rotation")
-        self.rotation_animation.setDuration(1000)
-        self.rotation_animation.setStartValue(0)
-        self.rotation_animation.setEndValue(360)
-        self.rotation_animation.setLoopCount(-1)  # Infinite loop
+    @property
+    def angle(self) -> int:
+        """Current spinner rotation in degrees"""
+        return self.spinner.angle
     
     def start_animation(self):
         """Start loading animation"""
-        self.rotation_animation.start()
+        self.spinner.start()
     
     def stop_animation(self):
         """Stop loading animation"""
-        self.rotation_animation.stop()
+        self.spinner.stop()
+
+class NavListModel(QAbstractListModel):
+    """Sidebar navigation entries as (text, tab index) pairs"""
+    
+    def __init__(self, items: Sequence[tuple] = (), parent=None):
+        super().__init__(parent)
+        self._items = list(items)
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+    
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        text, tab_index = self._items[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return text
+        if role == Qt.ItemDataRole.UserRole:
+            return tab_index
+        return None
+    
+    def row_for_tab(self, tab_index: int) -> int:
+        """Row of the entry that opens tab_index, or -1"""
+        for row, (_, index) in enumerate(self._items):
+            if index == tab_index:
+                return row
+        return -1
+
+
+class NavDelegate(QStyledItemDelegate):
+    """Paints nav entries: rounded highlight for the active one, hover tint otherwise"""
+    
+    ACTIVE_BG = QColor(DesignTokens.PRIMARY)
+    HOVER_BG = QColor(DesignTokens.BG_SECONDARY)
+    ACTIVE_TEXT = QColor(DesignTokens.TEXT_WHITE)
+    TEXT = QColor(DesignTokens.TEXT_SECONDARY)
+    
+    def paint(self, painter: QPainter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        rect = option.rect.adjusted(0, DesignTokens.SPACE_XS, 0, -DesignTokens.SPACE_XS)
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        
+        if selected:
+            background = self.ACTIVE_BG
+        elif option.state & QStyle.StateFlag.State_MouseOver:
+            background = self.HOVER_BG
+        else:
+            background = None
+        if background is not None:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(background)
+            painter.drawRoundedRect(QRectF(rect), DesignTokens.BORDER_RADIUS, DesignTokens.BORDER_RADIUS)
+        
+        font = QFont(option.font)
+        font.setWeight(QFont.Weight.DemiBold if selected else QFont.Weight.Medium)
+        painter.setFont(font)
+        painter.setPen(self.ACTIVE_TEXT if selected else self.TEXT)
+        text_rect = rect.adjusted(DesignTokens.SPACE_MD, 0, -DesignTokens.SPACE_MD, 0)
+        painter.drawText(
+            text_rect,
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            index.data(Qt.ItemDataRole.DisplayRole),
+        )
+        painter.restore()
+    
+    def sizeHint(self, option, index) -> QSize:
+        height = option.fontMetrics.height() + 2 * (DesignTokens.SPACE_MD + DesignTokens.SPACE_XS)
+        return QSize(option.rect.width(), height)
+
 
 class ModernSidebar(QWidget):
     """Modern responsive sidebar component"""
@@ -202,19 +343,47 @@ class ModernSidebar(QWidget):
         self.is_collapsed = False
         self.current_width = DesignTokens.SIDEBAR_WIDTH_FULL
         self.current_tab = 0
-        
-        self.setup_ui()
-        self.setup_style()
-        self.setup_animations()
+        # Index of the nav item currently marked active (none until first set)
+        self._active_nav_index = None
+        # Width animation is created on the first collapse/expand
+        self._width_animation = None
+        self._pending_target_width = self.current_width
+        
+        # Contents are built on first show (or first use), not here
+        self._built = False
+        self.setFixedWidth(self.current_width)
+    
+    def showEvent(self, event):
+        """Build the sidebar contents the first time it becomes visible"""
+        self._build_once()
+        super().showEvent(event)
+    
+    def _build_once(self):
+        """Build header, navigation and footer if not built yet"""
+        if self._built:
+            return
+        self._built = True
+        with self._batched_update():
+            self.setup_ui()
+            self.setup_style()
+    
+    @contextmanager
+    def _batched_update(self):
+        """Suspend repaints and signals so a rebuild lays out and paints once"""
+        self.setUpdatesEnabled(False)
+        self.blockSignals(True)
+        try:
+            yield
+        finally:
+            self.blockSignals(False)
+            self.setUpdatesEnabled(True)
+            self.updateGeometry()
     
     def setup_ui(self):
         """Setup sidebar UI"""
         layout = QVBoxLayout(self)
         layout.setSpacing(DesignTokens.SPACE_XS)
-        layout.setContentsMargins(
-            DesignTokens.SPACE_SM, DesignTokens.SPACE_MD,
-            DesignTokens.SPACE_SM, DesignTokens.SPACE_MD
-        )
+        layout.setContentsMargins(_SIDEBAR_MARGINS)
         
         # Header
         header = self.create_header()
@@ -223,9 +392,8 @@ class ModernSidebar(QWidget):
         layout.addSpacing(DesignTokens.SPACE_LG)
         
         # Navigation items
-        self.nav_items = self.create_navigation()
-        for item in self.nav_items:
-            layout.addWidget(item)
+        self.nav_list = self.create_navigation()
+        layout.addWidget(self.nav_list)
         
         layout.addStretch()
         
@@ -237,17 +405,11 @@ class ModernSidebar(QWidget):
         """Create sidebar header with logo and toggle"""
         header = QWidget()
         layout = QHBoxLayout(header)
-        layout.setContentsMargins(DesignTokens.SPACE_SM, 0, DesignTokens.SPACE_SM, 0)
+        layout.setContentsMargins(_SIDEBAR_SECTION_MARGINS)
         
         # Logo
         self.logo_label = QLabel("🎯 MuMu Manager")
-        self.logo_label.setStyleSheet(f"""
-        QLabel {{
-            font-size: {DesignTokens.FONT_SIZE_LG}px;
-            font-weight: 700;
-            color: {DesignTokens.TEXT_PRIMARY};
-        }}
-        """)
+        self.logo_label.setProperty("role", "sidebarLogo")
         layout.addWidget(self.logo_label)
         
         layout.addStretch()
@@ -260,10 +422,8 @@ class ModernSidebar(QWidget):
         
         return header
     
-    def create_navigation(self) -> List[QWidget]:
-        """Create navigation items"""
-        nav_items = []
-        
+    def create_navigation(self) -> QListView:
+        """Create navigation list (one view + delegate instead of a widget per item)"""
         items = [
             ("📊 Dashboard", 0),
             ("💻 Instances", 1), 
@@ -271,79 +431,90 @@ class ModernSidebar(QWidget):
             ("⚙️ Settings", 3),
         ]
         
-        for text, index in items:
-            item = self.create_nav_item(text, index)
-            nav_items.append(item)
-        
-        return nav_items
-    
-    def create_nav_item(self, text: str, index: int) -> QWidget:
-        """Create a single navigation item"""
-        item = QFrame()
-        item.setObjectName(f"nav_item_{index}")
-        item.setCursor(Qt.CursorShape.PointingHandCursor)
-        
-        layout = QHBoxLayout(item)
-        layout.setContentsMargins(
-            DesignTokens.SPACE_SM, DesignTokens.SPACE_SM,
-            DesignTokens.SPACE_SM, DesignTokens.SPACE_SM
-        )
-        
-        # Text with icon
-        text_label = QLabel(text)
-        text_label.setStyleSheet(f"""
-        QLabel {{
-            font-size: {DesignTokens.FONT_SIZE_MD}px;
-            color: {DesignTokens.TEXT_SECONDARY};
-            font-weight: 500;
-        }}
-        """)
-        layout.addWidget(text_label)
-        
-        layout.addStretch()
-        
-        # Style
-        item.setStyleSheet(StyleSheetManager.nav_item())
-        
-        # Click handler
-        def on_click():
-            self.set_active_tab(index)
-            self.tab_requested.emit(index)
-        
-        item.mousePressEvent = lambda e: on_click()
-        
-        return item
+        nav_list = QListView()
+        nav_list.setProperty("role", "navList")
+        nav_list.setFrameShape(QFrame.Shape.NoFrame)
+        nav_list.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        nav_list.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        nav_list.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        nav_list.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        nav_list.setMouseTracking(True)
+        nav_list.viewport().setCursor(_hand_cursor())
+        # Font set directly (not via QSS) so row heights are known before polish
+        font = nav_list.font()
+        font.setPixelSize(DesignTokens.FONT_SIZE_MD)
+        nav_list.setFont(font)
+        
+        self.nav_model = NavListModel(items, nav_list)
+        nav_list.setModel(self.nav_model)
+        nav_list.setItemDelegate(NavDelegate(nav_list))
+        nav_list.selectionModel().currentChanged.connect(self._on_nav_current_changed)
+        
+        # Fixed height so the stretch below keeps the footer at the bottom
+        nav_list.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        nav_list.setFixedHeight(nav_list.sizeHintForRow(0) * self.nav_model.rowCount())
+        
+        return nav_list
+    
+    def _on_nav_current_changed(self, current: QModelIndex, previous: QModelIndex):
+        """Request the tab of the nav entry the user moved to"""
+        if not current.isValid():
+            return
+        index = current.data(Qt.ItemDataRole.UserRole)
+        if index == self._active_nav_index:
+            # Selection set programmatically by set_active_tab
+            return
+        self.current_tab = index
+        self._active_nav_index = index
+        self.tab_requested.emit(index)
     
     def create_footer(self) -> QWidget:
         """Create sidebar footer"""
         footer = QWidget()
         layout = QVBoxLayout(footer)
         layout.setSpacing(DesignTokens.SPACE_XS)
-        layout.setContentsMargins(DesignTokens.SPACE_SM, 0, DesignTokens.SPACE_SM, 0)
+        layout.setContentsMargins(_SIDEBAR_SECTION_MARGINS)
         
         # Status indicator
         status = QLabel("🟢 Connected")
-        status.setStyleSheet(f"""
-        QLabel {{
-            color: {DesignTokens.SUCCESS};
-            font-size: {DesignTokens.FONT_SIZE_SM}px;
-            font-weight: 500;
-        }}
-        """)
+        status.setProperty("role", "sidebarStatus")
         layout.addWidget(status)
         
         return footer
     
     def setup_style(self):
-        """Apply sidebar styling"""
+        """Apply sidebar styling (header, nav items and footer are matched by role)"""
         self.setStyleSheet(StyleSheetManager.sidebar())
         self.setFixedWidth(self.current_width)
     
+    @property
+    def width_animation(self) -> QPropertyAnimation:
+        """Width animation, created on first access"""
+        if self._width_animation is None:
+            self.setup_animations()
+        return self._width_animation
+    
+    def _get_fixed_width(self) -> int:
+        return self.width()
+    
+    def _set_fixed_width(self, width: int):
+        self.setFixedWidth(width)
+    
+    # Animatable wrapper around setFixedWidth (Qt has no such property)
+    fixedWidth = pyqtProperty(int, fget=_get_fixed_width, fset=_set_fixed_width)
+    
     def setup_animations(self):
         """Setup width animations"""
-        self.width_animation = QPropertyAnimation(self, b"fixedWidth")
-        self.width_animation.setDuration(DesignTokens.ANIMATION_NORMAL)
-        self.width_animation.setEasingCurve(QEasingCurve.Type.OutCubic)
+        self._width_animation = QPropertyAnimation(self, b"fixedWidth")
+        self._width_animation.setDuration(DesignTokens.ANIMATION_NORMAL)
+        self._width_animation.setEasingCurve(QEasingCurve.Type.OutCubic)
+        # Connected once; the target of the latest animate_width call is emitted
+        self._width_animation.finished.connect(self._on_width_anim_finished)
+    
+    def _on_width_anim_finished(self):
+        """Report the width the sidebar settled on"""
+        self.current_width = self._pending_target_width
+        self.width_changed.emit(self._pending_target_width)
     
     def toggle_sidebar(self):
         """Toggle sidebar collapse state"""
@@ -354,6 +525,7 @@ class ModernSidebar(QWidget):
     
     def collapse_sidebar(self):
         """Collapse sidebar to icon-only mode"""
+        self._build_once()
         self.is_collapsed = True
         target_width = DesignTokens.SIDEBAR_WIDTH_COLLAPSED
         self.animate_width(target_width)
@@ -361,6 +533,7 @@ class ModernSidebar(QWidget):
     
     def expand_sidebar(self):
         """Expand sidebar to full mode"""
+        self._build_once()
         self.is_collapsed = False
         target_width = DesignTokens.SIDEBAR_WIDTH_FULL
         self.animate_width(target_width)
@@ -368,40 +541,126 @@ class ModernSidebar(QWidget):
     
     def animate_width(self, target_width: int):
         """Animate sidebar width change"""
+        if not USE_ANIMATIONS:
+            # Reduced motion: jump straight to the target, no animation is created
+            self.setFixedWidth(target_width)
+            self.current_width = target_width
+            self.width_changed.emit(target_width)
+            return
+        
+        self.width_animation.stop()
         self.width_animation.setStartValue(self.width())
         self.width_animation.setEndValue(target_width)
-        self.width_animation.finished.connect(
-            lambda: self.width_changed.emit(target_width)
-        )
+        self._pending_target_width = target_width
         self.width_animation.start()
     
     def set_active_tab(self, index: int):
         """Set active tab with visual feedback"""
         self.current_tab = index
+        self._build_once()
+        
+        if index == self._active_nav_index:
+            return
         
-        # Update visual state of nav items
-        for i, item in enumerate(self.nav_items):
-            if i == index:
-                item.setStyleSheet(f"""
-                QFrame {{
-                    background-color: {DesignTokens.PRIMARY};
-                    border-radius: {DesignTokens.BORDER_RADIUS}px;
-                    padding: {DesignTokens.SPACE_SM}px;
-                    margin: {DesignTokens.SPACE_XS}px 0px;
-                }}
-                QLabel {{
-                    color: {DesignTokens.TEXT_WHITE};
-                    font-weight: 600;
-                }}
-                """)
-            else:
-                item.setStyleSheet(StyleSheetManager.nav_item())
+        # Recorded first so the resulting currentChanged is not re-emitted as a request
+        self._active_nav_index = index
+        row = self.nav_model.row_for_tab(index)
+        if row >= 0:
+            with self._batched_update():
+                self.nav_list.setCurrentIndex(self.nav_model.index(row, 0))
 
-class ModernTable(QTableWidget):
+class ModernTableModel(QAbstractTableModel):
+    """Lightweight display-only table model
+    
+    Cells are stored column-wise (one Python list per column) instead of as
+    one QTableWidgetItem per cell.
+    """
+    
+    def __init__(self, rows: int = 0, columns: int = 0, headers: Optional[List[str]] = None, parent=None):
+        super().__init__(parent)
+        column_count = len(headers) if headers else columns
+        self._headers = list(headers) if headers else [str(i + 1) for i in range(column_count)]
+        self._columns = [[""] * rows for _ in range(column_count)]
+        self._row_count = rows
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._row_count
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns)
+    
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        value = self._columns[index.column()][index.row()]
+        return value if isinstance(value, str) else str(value)
+    
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or orientation != Qt.Orientation.Horizontal:
+            return None
+        return self._headers[section] if 0 <= section < len(self._headers) else None
+    
+    def set_headers(self, headers: List[str]):
+        """Replace the column headers (and column count), keeping cell data"""
+        self.beginResetModel()
+        self._headers = list(headers)
+        del self._columns[len(self._headers):]
+        while len(self._columns) < len(self._headers):
+            self._columns.append([""] * self._row_count)
+        self.endResetModel()
+    
+    def set_rows(self, rows: List[Sequence]):
+        """Replace all rows in a single model reset"""
+        width = max(len(self._headers), max(map(len, rows), default=0))
+        # Short rows are padded so zip() doesn't truncate every column to them
+        padded = [row if len(row) == width else list(row) + [""] * (width - len(row)) for row in rows]
+        self.beginResetModel()
+        self._row_count = len(rows)
+        self._columns = [list(column) for column in zip(*padded)] if rows else [[] for _ in range(width)]
+        self.endResetModel()
+    
+    def append_rows(self, rows: List[Sequence]):
+        """Append rows with a single insert notification"""
+        if not rows:
+            return
+        first = self._row_count
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for column_index, column in enumerate(self._columns):
+            column.extend(row[column_index] if column_index < len(row) else "" for row in rows)
+        self._row_count += len(rows)
+        self.endInsertRows()
+    
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder):
+        """Sort all columns by one column's values"""
+        if not 0 <= column < len(self._columns) or self._row_count < 2:
+            return
+        values = self._columns[column]
+        reverse = order == Qt.SortOrder.DescendingOrder
+        try:
+            order_map = sorted(range(self._row_count), key=values.__getitem__, reverse=reverse)
+        except TypeError:
+            # Mixed value types: fall back to text ordering
+            order_map = sorted(range(self._row_count), key=lambda row: str(values[row]), reverse=reverse)
+        
+        self.layoutAboutToBeChanged.emit()
+        old_persistent = self.persistentIndexList()
+        new_row_of = {old_row: new_row for new_row, old_row in enumerate(order_map)}
+        self._columns = [[col[row] for row in order_map] for col in self._columns]
+        self.changePersistentIndexList(
+            old_persistent,
+            [self.index(new_row_of[index.row()], index.column()) for index in old_persistent]
+        )
+        self.layoutChanged.emit()
+
+class ModernTable(QTableView):
     """Modern table with enhanced styling"""
     
+    ROW_HEIGHT = 36
+    
     def __init__(self, rows: int = 0, columns: int = 0):
-        super().__init__(rows, columns)
+        super().__init__()
+        self.table_model = ModernTableModel(rows, columns, parent=self)
+        self.setModel(self.table_model)
         self.setup_style()
         self.setup_behavior()
     
@@ -412,8 +671,50 @@ class ModernTable(QTableWidget):
         self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.verticalHeader().setVisible(False)
         self.horizontalHeader().setStretchLastSection(True)
+        # Uniform row heights: painting never has to measure rows
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setDefaultSectionSize(self.ROW_HEIGHT)
     
     def setup_behavior(self):
         """Setup modern table behavior"""
         self.setSortingEnabled(True)
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self._prev_sort = True
+    
+    def set_headers(self, headers: List[str]):
+        """Set column headers"""
+        self.table_model.set_headers(headers)
+    
+    def set_rows(self, rows: List[Sequence]):
+        """Replace table contents; rows are sequences of cell values"""
+        self.table_model.set_rows(rows)
+        self._apply_sort_indicator()
+    
+    def append_rows(self, rows: List[Sequence]):
+        """Append rows to the table"""
+        self.table_model.append_rows(rows)
+        self._apply_sort_indicator()
+    
+    def _apply_sort_indicator(self):
+        """Keep new rows in the order shown by the header's sort indicator"""
+        if self.isSortingEnabled():
+            header = self.horizontalHeader()
+            self.table_model.sort(header.sortIndicatorSection(), header.sortIndicatorOrder())
+    
+    def begin_bulk(self):
+        """Suspend sorting, repaints and signals before inserting many rows
+        
+        While sorting is enabled each set_rows()/append_rows() call re-sorts
+        the whole table; between begin_bulk() and end_bulk() none of them
+        does, and end_bulk() sorts once. Must be paired with end_bulk().
+        """
+        self._prev_sort = self.isSortingEnabled()
+        self.setSortingEnabled(False)
+        self.setUpdatesEnabled(False)
+        self.blockSignals(True)
+    
+    def end_bulk(self):
+        """Restore sorting (one sort for all inserted rows) and repaint"""
+        self.blockSignals(False)
+        self.setUpdatesEnabled(True)
+        self.setSortingEnabled(self._prev_sort)
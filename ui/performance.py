@@ -4,6 +4,9 @@ Performance Optimization Components
 """
 from PyQt6.QtCore import *
 from typing import Dict, Any, Callable, List
+import heapq
+import inspect
+import itertools
 import time
 
 class AsyncTaskManager(QObject):
@@ -18,73 +21,100 @@ class AsyncTaskManager(QObject):
     def __init__(self, max_workers: int = 4):
         super().__init__()
         self.max_workers = max_workers
-        self.active_tasks: Dict[str, QThread] = {}
-        self.task_queue: List[tuple] = []  # (priority, task_id, worker)
-        self.worker_pool = []
+        self.active_tasks: Dict[str, "AsyncWorker"] = {}
+        # Heap of (-priority, seq, task_id, func, args, kwargs); seq keeps FIFO
+        # order within a priority and avoids comparing callables
+        self.task_queue: List[tuple] = []
+        self._task_seq = itertools.count()
+        # task_id -> seq of its live queue entry; cancelled entries are left
+        # in the heap and skipped when popped
+        self._queued: Dict[str, int] = {}
+        # token -> cancelled worker whose run() has not returned yet; it
+        # still occupies a pool thread, so it counts against max_workers
+        self._draining: Dict[int, "AsyncWorker"] = {}
         
-        # Initialize worker pool
-        for i in range(max_workers):
-            worker = AsyncWorker(f"worker_{i}")
-            worker.signals.started.connect(self.on_task_started)
-            worker.signals.progress.connect(self.on_task_progress)
-            worker.signals.finished.connect(self.on_task_completed)
-            worker.signals.error.connect(self.on_task_failed)
-            self.worker_pool.append(worker)
+        # Pooled threads are reused across tasks instead of one QThread per slot
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(max_workers)
     
     def submit_task(self, task_id: str, func: Callable, priority: int = 0, *args, **kwargs) -> bool:
-        """Submit task with priority (higher number = higher priority)"""
+        """Submit task with priority (higher number = higher priority)
+
+        A func declaring a progress_callback parameter receives a callable
+        taking a percentage, reported through task_progress.
+        """
         # Check if task already exists
-        if task_id in self.active_tasks:
+        if task_id in self.active_tasks or task_id in self._queued:
             return False
         
-        # Find available worker
-        available_worker = None
-        for worker in self.worker_pool:
-            if not worker.isRunning():
-                available_worker = worker
-                break
-        
-        if available_worker:
+        if self._busy_workers() < self.max_workers:
             # Execute immediately
-            available_worker.setup_task(task_id, func, *args, **kwargs)
-            available_worker.start()
-            self.active_tasks[task_id] = available_worker
+            self._start_task(task_id, func, args, kwargs)
             return True
         else:
             # Add to queue with priority
-            self.task_queue.append((priority, task_id, func, args, kwargs))
-            self.task_queue.sort(key=lambda x: x[0], reverse=True)  # Sort by priority
-            self.queue_updated.emit(len(self.task_queue))
+            seq = next(self._task_seq)
+            heapq.heappush(self.task_queue, (-priority, seq, task_id, func, args, kwargs))
+            self._queued[task_id] = seq
+            self.queue_updated.emit(len(self._queued))
             return True
     
     def cancel_task(self, task_id: str) -> bool:
         """Cancel running or queued task"""
-        # Cancel running task
+        # Cancel running task: it can't be stopped safely, so its result is
+        # discarded; its slot is freed once run() returns (see _on_worker_released)
         if task_id in self.active_tasks:
-            worker = self.active_tasks[task_id]
-            worker.terminate()
-            worker.wait()
-            del self.active_tasks[task_id]
+            worker = self.active_tasks.pop(task_id)
+            worker.cancelled = True
+            self._draining[worker.token] = worker
             return True
         
-        # Remove from queue
-        for i, (priority, queued_id, func, args, kwargs) in enumerate(self.task_queue):
-            if queued_id == task_id:
-                del self.task_queue[i]
-                self.queue_updated.emit(len(self.task_queue))
-                return True
+        # Remove from queue (the heap entry is skipped when popped)
+        if self._queued.pop(task_id, None) is not None:
+            self.queue_updated.emit(len(self._queued))
+            return True
         
         return False
     
+    def _start_task(self, task_id: str, func: Callable, args: tuple, kwargs: dict):
+        """Hand a task to the thread pool"""
+        worker = AsyncWorker(task_id, func, *args, **kwargs)
+        worker.token = next(self._task_seq)
+        worker.signals.started.connect(self.on_task_started)
+        worker.signals.progress.connect(self.on_task_progress)
+        worker.signals.finished.connect(self.on_task_completed)
+        worker.signals.error.connect(self.on_task_failed)
+        worker.signals.released.connect(self._on_worker_released)
+        self.active_tasks[task_id] = worker
+        self.thread_pool.start(worker)
+    
+    def _pop_queued_task(self):
+        """Pop the highest priority live task, or None if the queue is empty"""
+        while self.task_queue:
+            _, seq, task_id, func, args, kwargs = heapq.heappop(self.task_queue)
+            if self._queued.get(task_id) == seq:
+                del self._queued[task_id]
+                return task_id, func, args, kwargs
+        return None
+    
     def get_queue_status(self) -> Dict[str, Any]:
         """Get current queue and task status"""
         return {
             'active_tasks': list(self.active_tasks.keys()),
-            'queued_tasks': [task_id for _, task_id, _, _, _ in self.task_queue],
-            'available_workers': sum(1 for w in self.worker_pool if not w.isRunning()),
-            'queue_size': len(self.task_queue)
+            'queued_tasks': list(self._queued),
+            'available_workers': max(0, self.max_workers - self._busy_workers()),
+            'queue_size': len(self._queued)
         }
     
+    def _busy_workers(self) -> int:
+        """Pool threads in use, including cancelled tasks still running"""
+        return len(self.active_tasks) + len(self._draining)
+    
+    def _on_worker_released(self, token: int):
+        """Free the slot of a cancelled task once its runnable has returned"""
+        if self._draining.pop(token, None) is not None:
+            self._process_queue()
+    
     def on_task_started(self, task_id: str):
         """Handle task start"""
         self.task_started.emit(task_id)
@@ -93,89 +123,137 @@ class AsyncTaskManager(QObject):
         """Handle task progress update"""
         self.task_progress.emit(task_id, progress)
     
-    def on_task_completed(self, task_id: str, result: Any):
+    def on_task_completed(self, task_id: str, token: int, result: Any):
         """Handle task completion"""
-        if task_id in self.active_tasks:
-            del self.active_tasks[task_id]
+        if not self._release_active(task_id, token):
+            return
         
         self.task_completed.emit(task_id, result)
         self._process_queue()
     
-    def on_task_failed(self, task_id: str, error: str):
+    def on_task_failed(self, task_id: str, token: int, error: str):
         """Handle task failure"""
-        if task_id in self.active_tasks:
-            del self.active_tasks[task_id]
+        if not self._release_active(task_id, token):
+            return
         
         self.task_failed.emit(task_id, error)
         self._process_queue()
     
+    def _release_active(self, task_id: str, token: int) -> bool:
+        """Remove the worker that sent a result signal
+
+        False for a stale signal: the task was cancelled (and maybe
+        resubmitted under the same id) after its worker emitted.
+        """
+        worker = self.active_tasks.get(task_id)
+        if worker is None or worker.token != token:
+            return False
+        del self.active_tasks[task_id]
+        return True
+    
     def _process_queue(self):
         """Process next task in queue if workers available"""
-        if not self.task_queue:
+        if not self._queued:
             return
         
-        # Find available worker
-        for worker in self.worker_pool:
-            if not worker.isRunning() and self.task_queue:
-                priority, task_id, func, args, kwargs = self.task_queue.pop(0)
-                worker.setup_task(task_id, func, *args, **kwargs)
-                worker.start()
-                self.active_tasks[task_id] = worker
-                self.queue_updated.emit(len(self.task_queue))
+        # Fill every free slot in one pass, then report the queue size once
+        started = False
+        while self._busy_workers() < self.max_workers:
+            task = self._pop_queued_task()
+            if task is None:
                 break
+            task_id, func, args, kwargs = task
+            self._start_task(task_id, func, args, kwargs)
+            started = True
+        
+        if started:
+            self.queue_updated.emit(len(self._queued))
+
+# Minimum spacing between progress signals of one task (~60 Hz)
+PROGRESS_THROTTLE_SECONDS = 0.016
 
-class AsyncWorker(QThread):
+def _accepts_progress_callback(func: Callable) -> bool:
+    """Whether func declares a progress_callback parameter"""
+    try:
+        return 'progress_callback' in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        # Builtins without an introspectable signature
+        return False
+
+class AsyncWorker(QRunnable):
     """Enhanced async worker with progress reporting"""
     
-    def __init__(self, worker_id: str):
+    def __init__(self, task_id: str, func: Callable, *args, **kwargs):
         super().__init__()
-        self.worker_id = worker_id
-        self.task_id = ""
-        self.func = None
-        self.args = ()
-        self.kwargs = {}
-        self.signals = AsyncWorkerSignals()
-    
-    def setup_task(self, task_id: str, func: Callable, *args, **kwargs):
-        """Setup task for execution"""
         self.task_id = task_id
         self.func = func
         self.args = args
         self.kwargs = kwargs
+        if 'progress_callback' not in kwargs and _accepts_progress_callback(func):
+            self.kwargs['progress_callback'] = self.report_progress
+        # Set by AsyncTaskManager.cancel_task; checked instead of terminating
+        self.cancelled = False
+        # Assigned by AsyncTaskManager, reported by signals.released
+        self.token = 0
+        self.signals = AsyncWorkerSignals()
+        self.setAutoDelete(True)
+        # Progress throttling state (only touched on the worker thread)
+        self._last_progress_time = 0.0
+        self._pending_progress = None
     
     def run(self):
         """Execute the task with error handling"""
-        if not self.func:
-            return
-        
         try:
+            if self.cancelled:
+                return
+            
             self.signals.started.emit(self.task_id)
             
             # Execute function
             result = self.func(*self.args, **self.kwargs)
             
-            self.signals.finished.emit(self.task_id, result)
+            if not self.cancelled:
+                self._flush_progress()
+                self.signals.finished.emit(self.task_id, self.token, result)
             
         except Exception as e:
-            self.signals.error.emit(self.task_id, str(e))
+            if not self.cancelled:
+                self.signals.error.emit(self.task_id, self.token, str(e))
+        finally:
+            # The pool thread is free again, even for a cancelled task
+            self.signals.released.emit(self.token)
     
     def report_progress(self, progress: int):
-        """Report progress from within task"""
-        self.signals.progress.emit(self.task_id, progress)
+        """Report progress from within task, at most once per throttle window"""
+        now = time.monotonic()
+        if progress >= 100 or now - self._last_progress_time >= PROGRESS_THROTTLE_SECONDS:
+            self._last_progress_time = now
+            self._pending_progress = None
+            self.signals.progress.emit(self.task_id, progress)
+        else:
+            # Latest value is kept and sent by a later report or on completion
+            self._pending_progress = progress
+    
+    def _flush_progress(self):
+        """Emit the last throttled progress value, if any"""
+        if self._pending_progress is not None:
+            self.signals.progress.emit(self.task_id, self._pending_progress)
+            self._pending_progress = None
 
 class AsyncWorkerSignals(QObject):
     """Signals for async worker communication"""
     started = pyqtSignal(str)
     progress = pyqtSignal(str, int)
-    finished = pyqtSignal(str, object)
-    error = pyqtSignal(str, str)
+    finished = pyqtSignal(str, int, object)  # task_id, worker token, result
+    error = pyqtSignal(str, int, str)  # task_id, worker token, message
+    released = pyqtSignal(int)  # worker token, emitted when run() returns
 
 class PerformanceMonitor(QObject):
     """Monitor application performance metrics"""
     
     metrics_updated = pyqtSignal(dict)
     
-    def __init__(self):
+    def __init__(self, task_manager: AsyncTaskManager = None):
         super().__init__()
         self.start_time = time.time()
         self.metrics = {
@@ -188,29 +266,44 @@ class PerformanceMonitor(QObject):
             'uptime': 0
         }
         
-        # Setup monitoring timer
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_metrics)
-        self.timer.start(5000)  # Update every 5 seconds
-    
-    def update_metrics(self):
-        """Update performance metrics"""
+        # One reusable process handle (None without psutil); cpu_percent is
+        # primed so the first sample measures a real interval
         try:
             import psutil
-            process = psutil.Process()
-            
-            self.metrics.update({
-                'memory_usage': process.memory_info().rss / 1024 / 1024,  # MB
-                'cpu_usage': process.cpu_percent(),
-                'uptime': time.time() - self.start_time
-            })
-            
-            self.metrics_updated.emit(self.metrics.copy())
-            
+            self._proc = psutil.Process()
+            self._proc.cpu_percent(interval=None)
         except ImportError:
-            # Fallback if psutil not available
-            self.metrics['uptime'] = time.time() - self.start_time
-            self.metrics_updated.emit(self.metrics.copy())
+            self._proc = None
+        
+        # Sample every 5 seconds on a pool thread so psutil calls never block
+        # the GUI; the sample is merged into self.metrics on the GUI thread
+        self.task_manager = task_manager or AsyncTaskManager(max_workers=1)
+        self.task_manager.task_completed.connect(self._on_metrics_sampled)
+        self.scheduler = BackgroundTaskScheduler(self.task_manager)
+        self.scheduler.schedule_recurring("perf_monitor", self._sample_metrics, 5000)
+    
+    def update_metrics(self):
+        """Update performance metrics"""
+        self._apply_sample(self._sample_metrics())
+    
+    def _sample_metrics(self) -> Dict[str, float]:
+        """Read process metrics without touching self.metrics (safe on a worker)"""
+        sample = {'uptime': time.time() - self.start_time}
+        if self._proc is not None:
+            sample['memory_usage'] = self._proc.memory_info().rss / 1024 / 1024  # MB
+            sample['cpu_usage'] = self._proc.cpu_percent()
+        # Without psutil only uptime is sampled
+        return sample
+    
+    def _on_metrics_sampled(self, task_id: str, sample: Any):
+        """Merge a background sample (task_completed is delivered on the GUI thread)"""
+        if task_id == "perf_monitor":
+            self._apply_sample(sample)
+    
+    def _apply_sample(self, sample: Dict[str, float]):
+        """Store sampled values and publish a snapshot of all metrics"""
+        self.metrics.update(sample)
+        self.metrics_updated.emit(self.metrics.copy())
     
     def increment_counter(self, counter_name: str):
         """Increment a performance counter"""
@@ -235,10 +328,10 @@ class BackgroundTaskScheduler(QObject):
             self.unschedule(task_id)
         
         timer = QTimer()
+        # Fixed task id: submit_task refuses it while the previous run is still
+        # active or queued, so slow tasks don't pile up
         timer.timeout.connect(
-            lambda: self.task_manager.submit_task(
-                f"{task_id}_{int(time.time())}", func, priority=-1, *args, **kwargs
-            )
+            lambda: self.task_manager.submit_task(task_id, func, -1, *args, **kwargs)
         )
         timer.start(interval_ms)
         self.scheduled_tasks[task_id] = timer
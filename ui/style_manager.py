@@ -2,164 +2,262 @@
 Style Manager - Generate consistent stylesheets
 ==============================================
 """
+from functools import lru_cache
+from string import Template
 from .design_tokens import DesignTokens
 
-class StyleSheetManager:
-    """Generate consistent stylesheets from design tokens"""
-    
-    @staticmethod
-    def button(variant: str = "primary", size: str = "md") -> str:
-        """Generate button stylesheet"""
-        colors = {
-            "primary": (DesignTokens.PRIMARY, DesignTokens.PRIMARY_HOVER, DesignTokens.TEXT_WHITE),
-            "secondary": (DesignTokens.SECONDARY, "#475569", DesignTokens.TEXT_WHITE),
-            "success": (DesignTokens.SUCCESS, "#059669", DesignTokens.TEXT_WHITE),
-            "danger": (DesignTokens.DANGER, "#dc2626", DesignTokens.TEXT_WHITE),
-            "outline": (DesignTokens.BG_PRIMARY, DesignTokens.BG_SECONDARY, DesignTokens.TEXT_PRIMARY),
-        }
-        
-        sizes = {
-            "sm": (f"{DesignTokens.SPACE_XS}px {DesignTokens.SPACE_SM}px", DesignTokens.FONT_SIZE_SM, "20px"),
-            "md": (f"{DesignTokens.SPACE_SM}px {DesignTokens.SPACE_MD}px", DesignTokens.FONT_SIZE_MD, "32px"),
-            "lg": (f"{DesignTokens.SPACE_MD}px {DesignTokens.SPACE_LG}px", DesignTokens.FONT_SIZE_LG, "40px"),
-        }
-        
-        bg_color, hover_color, text_color = colors.get(variant, colors["primary"])
-        padding, font_size, min_height = sizes.get(size, sizes["md"])
-        
-        border_style = ""
-        if variant == "outline":
-            border_style = f"border: {DesignTokens.BORDER_WIDTH}px solid {DesignTokens.SECONDARY};"
-        
-        return f"""
-        QPushButton {{
-            background-color: {bg_color};
-            {border_style}
-            border-radius: {DesignTokens.BORDER_RADIUS}px;
-            color: {text_color};
-            font-size: {font_size}px;
+# Button sheets vary with variant and size, so the template is parsed once
+# here and only substituted per call (the other sheets are built once)
+_BUTTON_TEMPLATE = Template("""
+        QPushButton {
+            background-color: ${bg_color};
+            ${border_style}
+            border-radius: ${radius}px;
+            color: ${text_color};
+            font-size: ${font_size}px;
             font-weight: 500;
-            padding: {padding};
-            min-height: {min_height};
+            padding: ${padding};
+            min-height: ${min_height};
             outline: none;
-        }}
-        QPushButton:hover {{
-            background-color: {hover_color};
-        }}
-        QPushButton:pressed {{
-            background-color: {hover_color};
+        }
+        QPushButton:hover {
+            background-color: ${hover_color};
+        }
+        QPushButton:pressed {
+            background-color: ${hover_color};
             margin-top: 1px;
             margin-left: 1px;
-        }}
-        QPushButton:disabled {{
-            background-color: {DesignTokens.BG_TERTIARY};
-            color: {DesignTokens.TEXT_MUTED};
+        }
+        QPushButton:disabled {
+            background-color: ${disabled_bg};
+            color: ${disabled_text};
             border: none;
-        }}
-        """
+        }
+        """)
+
+
+@lru_cache(maxsize=32)
+def _build_button(variant: str = "primary", size: str = "md") -> str:
+    """Generate button stylesheet"""
+    colors = {
+        "primary": (DesignTokens.PRIMARY, DesignTokens.PRIMARY_HOVER, DesignTokens.TEXT_WHITE),
+        "secondary": (DesignTokens.SECONDARY, "#475569", DesignTokens.TEXT_WHITE),
+        "success": (DesignTokens.SUCCESS, "#059669", DesignTokens.TEXT_WHITE),
+        "danger": (DesignTokens.DANGER, "#dc2626", DesignTokens.TEXT_WHITE),
+        "outline": (DesignTokens.BG_PRIMARY, DesignTokens.BG_SECONDARY, DesignTokens.TEXT_PRIMARY),
+    }
+
+    sizes = {
+        "sm": (f"{DesignTokens.SPACE_XS}px {DesignTokens.SPACE_SM}px", DesignTokens.FONT_SIZE_SM, "20px"),
+        "md": (f"{DesignTokens.SPACE_SM}px {DesignTokens.SPACE_MD}px", DesignTokens.FONT_SIZE_MD, "32px"),
+        "lg": (f"{DesignTokens.SPACE_MD}px {DesignTokens.SPACE_LG}px", DesignTokens.FONT_SIZE_LG, "40px"),
+    }
+
+    bg_color, hover_color, text_color = colors.get(variant, colors["primary"])
+    padding, font_size, min_height = sizes.get(size, sizes["md"])
+
+    border_style = ""
+    if variant == "outline":
+        border_style = f"border: {DesignTokens.BORDER_WIDTH}px solid {DesignTokens.SECONDARY};"
+
+    return _BUTTON_TEMPLATE.substitute(
+        bg_color=bg_color,
+        hover_color=hover_color,
+        text_color=text_color,
+        border_style=border_style,
+        radius=DesignTokens.BORDER_RADIUS,
+        font_size=font_size,
+        padding=padding,
+        min_height=min_height,
+        disabled_bg=DesignTokens.BG_TERTIARY,
+        disabled_text=DesignTokens.TEXT_MUTED,
+    )
+
+
+def _build_card(elevated: bool = True) -> str:
+    """Generate card stylesheet"""
+    # QSS has no box-shadow; elevation is a heavier bottom edge instead of
+    # a QGraphicsDropShadowEffect, which forces offscreen rendering
+    elevation = ""
+    if elevated:
+        elevation = f"border-bottom: {DesignTokens.BORDER_WIDTH * 2}px solid {DesignTokens.SHADOW_BORDER};"
+
+    # Scoped to the card itself: QLabel is a QFrame, so a plain QFrame rule
+    # would give the title and subtitle their own border and padding
+    return f"""
+    ModernCard {{
+        background-color: {DesignTokens.BG_PRIMARY};
+        border: {DesignTokens.BORDER_WIDTH}px solid {DesignTokens.BG_TERTIARY};
+        {elevation}
+        border-radius: {DesignTokens.BORDER_RADIUS}px;
+        padding: {DesignTokens.SPACE_MD}px;
+    }}
+    QLabel[role="cardTitle"] {{
+        font-size: {DesignTokens.FONT_SIZE_LG}px;
+        font-weight: 600;
+        color: {DesignTokens.TEXT_PRIMARY};
+        margin-bottom: {DesignTokens.SPACE_XS}px;
+    }}
+    QLabel[role="cardSubtitle"] {{
+        font-size: {DesignTokens.FONT_SIZE_SM}px;
+        color: {DesignTokens.TEXT_SECONDARY};
+    }}
+    """
+
+
+def _build_progress_bar() -> str:
+    """Generate progress bar stylesheet"""
+    return f"""
+    QProgressBar {{
+        border: none;
+        border-radius: {DesignTokens.BORDER_RADIUS_SM}px;
+        background-color: {DesignTokens.BG_TERTIARY};
+        height: 8px;
+        text-align: center;
+        font-size: {DesignTokens.FONT_SIZE_SM}px;
+        color: {DesignTokens.TEXT_SECONDARY};
+    }}
+    QProgressBar::chunk {{
+        border-radius: {DesignTokens.BORDER_RADIUS_SM}px;
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 {DesignTokens.PRIMARY}, stop:1 {DesignTokens.PRIMARY_HOVER});
+    }}
+    """
+
+
+def _build_sidebar() -> str:
+    """Generate sidebar stylesheet, including its header, nav items and footer"""
+    return f"""
+    QWidget {{
+        background-color: {DesignTokens.BG_PRIMARY};
+        border-right: {DesignTokens.BORDER_WIDTH}px solid {DesignTokens.BG_TERTIARY};
+    }}
+    QLabel[role="sidebarLogo"] {{
+        font-size: {DesignTokens.FONT_SIZE_LG}px;
+        font-weight: 700;
+        color: {DesignTokens.TEXT_PRIMARY};
+    }}
+    QLabel[role="sidebarStatus"] {{
+        color: {DesignTokens.SUCCESS};
+        font-size: {DesignTokens.FONT_SIZE_SM}px;
+        font-weight: 500;
+    }}
+    QListView[role="navList"] {{
+        background-color: transparent;
+        border: none;
+        outline: none;
+    }}
+    """
+
+
+def _build_loading_indicator() -> str:
+    """Generate loading indicator stylesheet"""
+    return f"""
+    QLabel[role="loadingMessage"] {{
+        font-size: {DesignTokens.FONT_SIZE_MD}px;
+        color: {DesignTokens.TEXT_SECONDARY};
+    }}
+    """
+
+
+def _build_table() -> str:
+    """Generate modern table stylesheet"""
+    return f"""
+    QTableView {{
+        background-color: {DesignTokens.BG_PRIMARY};
+        alternate-background-color: {DesignTokens.BG_SECONDARY};
+        gridline-color: {DesignTokens.BG_TERTIARY};
+        border: {DesignTokens.BORDER_WIDTH}px solid {DesignTokens.BG_TERTIARY};
+        border-radius: {DesignTokens.BORDER_RADIUS}px;
+        selection-background-color: {DesignTokens.PRIMARY};
+    }}
+    QTableView::item {{
+        padding: {DesignTokens.SPACE_SM}px;
+        border: none;
+    }}
+    QHeaderView::section {{
+        background-color: {DesignTokens.BG_SECONDARY};
+        padding: {DesignTokens.SPACE_SM}px;
+        border: none;
+        font-weight: 600;
+        color: {DesignTokens.TEXT_PRIMARY};
+    }}
+    """
+
+
+def _build_input_field() -> str:
+    """Generate input field stylesheet"""
+    return f"""
+    QLineEdit, QTextEdit, QComboBox {{
+        background-color: {DesignTokens.BG_PRIMARY};
+        border: {DesignTokens.BORDER_WIDTH}px solid {DesignTokens.BG_TERTIARY};
+        border-radius: {DesignTokens.BORDER_RADIUS}px;
+        padding: {DesignTokens.SPACE_SM}px;
+        font-size: {DesignTokens.FONT_SIZE_MD}px;
+        color: {DesignTokens.TEXT_PRIMARY};
+    }}
+    QLineEdit:focus, QTextEdit:focus, QComboBox:focus {{
+        border-color: {DesignTokens.PRIMARY};
+        outline: none;
+    }}
+    """
+
+
+# Stylesheets only depend on the design tokens, so every one the design
+# system can produce is built once here and shared by all widgets
+BUTTON_VARIANTS = ("primary", "secondary", "success", "danger", "outline")
+BUTTON_SIZES = ("sm", "md", "lg")
+_BUTTON_STYLES = {
+    (variant, size): _build_button(variant, size)
+    for variant in BUTTON_VARIANTS
+    for size in BUTTON_SIZES
+}
+_CARD_STYLES = {elevated: _build_card(elevated) for elevated in (True, False)}
+_PROGRESS_BAR_STYLE = _build_progress_bar()
+_SIDEBAR_STYLE = _build_sidebar()
+_LOADING_INDICATOR_STYLE = _build_loading_indicator()
+_TABLE_STYLE = _build_table()
+_INPUT_FIELD_STYLE = _build_input_field()
+
+
+class StyleSheetManager:
+    """Consistent stylesheets from design tokens (precomputed at import)"""
+    
+    @staticmethod
+    def button(variant: str = "primary", size: str = "md") -> str:
+        """Get button stylesheet"""
+        style = _BUTTON_STYLES.get((variant, size))
+        if style is None:
+            # Unknown variant/size falls back to the defaults inside the builder
+            style = _build_button(variant, size)
+        return style
 
     @staticmethod
     def card(elevated: bool = True) -> str:
-        """Generate card stylesheet"""
-        shadow = DesignTokens.SHADOW_MD if elevated else "none"
-        
-        return f"""
-        QFrame {{
-            background-color: {DesignTokens.BG_PRIMARY};
-            border: {DesignTokens.BORDER_WIDTH}px solid {DesignTokens.BG_TERTIARY};
-            border-radius: {DesignTokens.BORDER_RADIUS}px;
-            padding: {DesignTokens.SPACE_MD}px;
-        }}
-        """
+        """Get card stylesheet"""
+        return _CARD_STYLES[bool(elevated)]
 
     @staticmethod
     def progress_bar() -> str:
-        """Generate progress bar stylesheet"""
-        return f"""
-        QProgressBar {{
-            border: none;
-            border-radius: {DesignTokens.BORDER_RADIUS_SM}px;
-            background-color: {DesignTokens.BG_TERTIARY};
-            height: 8px;
-            text-align: center;
-            font-size: {DesignTokens.FONT_SIZE_SM}px;
-            color: {DesignTokens.TEXT_SECONDARY};
-        }}
-        QProgressBar::chunk {{
-            border-radius: {DesignTokens.BORDER_RADIUS_SM}px;
-            background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                stop:0 {DesignTokens.PRIMARY}, stop:1 {DesignTokens.PRIMARY_HOVER});
-        }}
-        """
+        """Get progress bar stylesheet"""
+        return _PROGRESS_BAR_STYLE
 
     @staticmethod
     def sidebar() -> str:
-        """Generate sidebar stylesheet"""
-        return f"""
-        QWidget {{
-            background-color: {DesignTokens.BG_PRIMARY};
-            border-right: {DesignTokens.BORDER_WIDTH}px solid {DesignTokens.BG_TERTIARY};
-        }}
-        """
+        """Get sidebar stylesheet, including its header, nav items and footer"""
+        return _SIDEBAR_STYLE
 
     @staticmethod
-    def nav_item() -> str:
-        """Generate navigation item stylesheet"""
-        return f"""
-        QFrame {{
-            border-radius: {DesignTokens.BORDER_RADIUS}px;
-            padding: {DesignTokens.SPACE_SM}px;
-            margin: {DesignTokens.SPACE_XS}px 0px;
-        }}
-        QFrame:hover {{
-            background-color: {DesignTokens.BG_SECONDARY};
-        }}
-        QLabel {{
-            font-size: {DesignTokens.FONT_SIZE_MD}px;
-            color: {DesignTokens.TEXT_SECONDARY};
-            font-weight: 500;
-        }}
-        """
+    def loading_indicator() -> str:
+        """Get loading indicator stylesheet"""
+        return _LOADING_INDICATOR_STYLE
 
     @staticmethod
     def table() -> str:
-        """Generate modern table stylesheet"""
-        return f"""
-        QTableWidget {{
-            background-color: {DesignTokens.BG_PRIMARY};
-            alternate-background-color: {DesignTokens.BG_SECONDARY};
-            gridline-color: {DesignTokens.BG_TERTIARY};
-            border: {DesignTokens.BORDER_WIDTH}px solid {DesignTokens.BG_TERTIARY};
-            border-radius: {DesignTokens.BORDER_RADIUS}px;
-            selection-background-color: {DesignTokens.PRIMARY};
-        }}
-        QTableWidget::item {{
-            padding: {DesignTokens.SPACE_SM}px;
-            border: none;
-        }}
-        QHeaderView::section {{
-            background-color: {DesignTokens.BG_SECONDARY};
-            padding: {DesignTokens.SPACE_SM}px;
-            border: none;
-            font-weight: 600;
-            color: {DesignTokens.TEXT_PRIMARY};
-        }}
-        """
+        """Get modern table stylesheet"""
+        return _TABLE_STYLE
 
     @staticmethod
     def input_field() -> str:
-        """Generate input field stylesheet"""
-        return f"""
-        QLineEdit, QTextEdit, QComboBox {{
-            background-color: {DesignTokens.BG_PRIMARY};
-            border: {DesignTokens.BORDER_WIDTH}px solid {DesignTokens.BG_TERTIARY};
-            border-radius: {DesignTokens.BORDER_RADIUS}px;
-            padding: {DesignTokens.SPACE_SM}px;
-            font-size: {DesignTokens.FONT_SIZE_MD}px;
-            color: {DesignTokens.TEXT_PRIMARY};
-        }}
-        QLineEdit:focus, QTextEdit:focus, QComboBox:focus {{
-            border-color: {DesignTokens.PRIMARY};
-            outline: none;
-        }}
-        """
+        """Get input field stylesheet"""
+        return _INPUT_FIELD_STYLE
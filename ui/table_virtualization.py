@@ -7,6 +7,14 @@ from PyQt6.QtWidgets import QAbstractScrollArea, QScrollBar
 from PyQt6.QtCore import QRect, QTimer, pyqtSignal
 from PyQt6.QtGui import QPainter, QFont
 
+
+def _visible_range(viewport_height, scroll_value, row_height, buffer_size, total_items):
+    """Rows [start, end) covering the viewport plus buffer_size rows on each side"""
+    start_row = max(0, scroll_value // row_height - buffer_size)
+    visible_count = viewport_height // row_height + 2 * buffer_size
+    return start_row, min(total_items, start_row + visible_count)
+
+
 class VirtualizedTableView:
     """Table virtualization cho performance cao"""
     
@@ -16,23 +24,35 @@ class VirtualizedTableView:
         self.total_items = 0
         self.row_height = 30
         self.buffer_size = 10  # Extra rows to render
+        self._last_range = None
         
-        # Performance tracking
-        self.last_scroll_time = 0
-        self.scroll_debounce = QTimer()
-        self.scroll_debounce.setSingleShot(True)
-        self.scroll_debounce.setInterval(16)  # 60 FPS
-        self.scroll_debounce.timeout.connect(self._update_visible_rows)
+        # Scroll throttling: update on the first tick, then at most once per
+        # 16 ms window (60 FPS) with the latest position
+        self._scroll_pending = False
+        self.scroll_throttle = QTimer()
+        self.scroll_throttle.setSingleShot(True)
+        self.scroll_throttle.setInterval(16)
+        self.scroll_throttle.timeout.connect(self._on_throttle_timeout)
         
         # Connect scroll events
         if hasattr(self.table, 'verticalScrollBar'):
             self.table.verticalScrollBar().valueChanged.connect(self._on_scroll)
     
     def _on_scroll(self, value):
-        """Handle scroll events với debouncing"""
-        import time
-        self.last_scroll_time = time.time()
-        self.scroll_debounce.start()
+        """Handle scroll events với throttling"""
+        if self.scroll_throttle.isActive():
+            # Inside the window: only remember that an update is due
+            self._scroll_pending = True
+            return
+        self._update_visible_rows()
+        self.scroll_throttle.start()
+    
+    def _on_throttle_timeout(self):
+        """Apply the scroll position reached during the throttle window"""
+        if self._scroll_pending:
+            self._scroll_pending = False
+            self._update_visible_rows()
+            self.scroll_throttle.start()
     
     def _update_visible_rows(self):
         """Update chỉ những rows visible + buffer"""
@@ -40,18 +60,19 @@ class VirtualizedTableView:
             return
             
         # Tính visible range
-        viewport_height = self.table.viewport().height()
-        scroll_value = self.table.verticalScrollBar().value()
-        
-        start_row = max(0, scroll_value // self.row_height - self.buffer_size)
-        visible_count = (viewport_height // self.row_height) + (2 * self.buffer_size)
-        end_row = min(self.total_items, start_row + visible_count)
-        
-        # Chỉ update nếu range thay đổi đáng kể
-        new_range = (start_row, end_row)
-        if not hasattr(self, '_last_range') or abs(new_range[0] - self._last_range[0]) > 5:
-            self._render_visible_rows(start_row, end_row)
-            self._last_range = new_range
+        new_range = _visible_range(
+            self.table.viewport().height(),
+            self.table.verticalScrollBar().value(),
+            self.row_height,
+            self.buffer_size,
+            self.total_items,
+        )
+
+        # Chỉ update nếu range thay đổi
+        if new_range == self._last_range:
+            return
+        self._render_visible_rows(*new_range)
+        self._last_range = new_range
     
     def _render_visible_rows(self, start_row, end_row):
         """Render chỉ visible rows để tăng performance"""
@@ -70,7 +91,7 @@ class VirtualizedTableView:
         
     def get_performance_stats(self):
         """Get virtualization performance stats"""
-        visible_range = getattr(self, '_last_range', (0, 0))
+        visible_range = self._last_range or (0, 0)
         return {
             'total_items': self.total_items,
             'visible_range': visible_range,
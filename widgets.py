@@ -1,10 +1,14 @@
 # widgets.py - Các widget PyQt6 tùy chỉnh cho ứng dụng
 
 from PyQt6.QtWidgets import QStyledItemDelegate
-from PyQt6.QtGui import QPainter, QBrush, QColor, QPen, QMouseEvent
+from PyQt6.QtGui import QPainter, QPixmap, QPixmapCache, QBrush, QColor, QPen, QMouseEvent
 from PyQt6.QtCore import Qt, pyqtSignal, QRect, QEvent
+import logging
+from typing import Tuple
 from constants import TableColumn
 
+logger = logging.getLogger(__name__)
+
 class StatusPillDelegate(QStyledItemDelegate):
     """Vẽ một viên thuốc màu cho các trạng thái trong bảng."""
     # Tối ưu hóa: Tạo sẵn các đối tượng QColor để tránh tạo lại liên tục
@@ -15,33 +19,56 @@ class StatusPillDelegate(QStyledItemDelegate):
         "stopping": QColor("#f39c12"),
         "restarting": QColor("#8e44ad"),
     }
-    
+    # Brush/pen dùng lại cho mọi lần vẽ, không tạo mới mỗi ô
+    BRUSHES = {k: QBrush(c) for k, c in COLORS.items()}
+    WHITE_PEN = QPen(Qt.GlobalColor.white)
+    NO_PEN = QPen(Qt.PenStyle.NoPen)
+
     def paint(self, painter: QPainter, option, index):
         status_data = index.data(Qt.ItemDataRole.UserRole)
-        painter.save()
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
         rect = option.rect.adjusted(8, 6, -8, -6)
+        if rect.width() <= 0 or rect.height() <= 0:
+            return
 
         # Mặc định
         text = "Offline"
-        bg_color = self.COLORS["offline"]
+        key = "offline"
 
         if isinstance(status_data, bool):
             if status_data: # is_running is True
                 text = "Running"
-                bg_color = self.COLORS["running"]
+                key = "running"
         elif isinstance(status_data, str):
             text = f"{status_data.capitalize()}..."
-            bg_color = self.COLORS.get(status_data, self.COLORS["offline"])
-        
-        painter.setBrush(QBrush(bg_color))
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.drawRoundedRect(rect, rect.height() / 2, rect.height() / 2)
-
-        painter.setPen(QPen(Qt.GlobalColor.white))
-        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
-        painter.restore()
+            key = status_data
+
+        # Chỉ có vài trạng thái x vài kích thước: vẽ mỗi tổ hợp một lần vào
+        # QPixmapCache, các lần sau chỉ còn một lần blit
+        widget = option.widget
+        dpr = widget.devicePixelRatioF() if widget is not None else painter.device().devicePixelRatioF()
+        cache_key = f"pill:{key}:{rect.width()}x{rect.height()}@{dpr}:{option.font.key()}"
+        pixmap = QPixmapCache.find(cache_key)
+        if pixmap is None:
+            pixmap = self._render_pill(key, text, rect.width(), rect.height(), dpr, option.font)
+            QPixmapCache.insert(cache_key, pixmap)
+        painter.drawPixmap(rect.topLeft(), pixmap)
+
+    def _render_pill(self, key: str, text: str, width: int, height: int, dpr: float, font) -> QPixmap:
+        """Vẽ viên thuốc (nền + chữ) vào một QPixmap trong suốt."""
+        pixmap = QPixmap(round(width * dpr), round(height * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setFont(font)
+        painter.setBrush(self.BRUSHES.get(key, self.BRUSHES["offline"]))
+        painter.setPen(self.NO_PEN)
+        painter.drawRoundedRect(0, 0, width, height, height / 2, height / 2)
+        painter.setPen(self.WHITE_PEN)
+        painter.drawText(QRect(0, 0, width, height), Qt.AlignmentFlag.AlignCenter, text)
+        painter.end()
+        return pixmap
 
 
 class CheckboxDelegate(QStyledItemDelegate):
@@ -57,37 +84,30 @@ class CheckboxDelegate(QStyledItemDelegate):
 
     def editorEvent(self, event, model, option, index):
         """Handle mouse events for checkbox editing."""
-        print(f"🖱️ CheckboxDelegate.editorEvent: column={index.column()}, event_type={event.type()}")
-        
         # Only handle checkbox column
         if index.column() != 0:  # TableColumn.CHECKBOX = 0
             return super().editorEvent(event, model, option, index)
             
         # Only handle MouseButtonPress (event type 2), ignore Release (3), DblClick (4), etc.
         if event.type() == QEvent.Type.MouseButtonPress:
-            print(f"🖱️ Mouse button press detected")
             # Check if it's a QMouseEvent and left button
             if hasattr(event, 'button') and event.button() == Qt.MouseButton.LeftButton:
-                print(f"🖱️ Left button click on checkbox at row {index.row()}")
                 # Toggle checkbox state on left mouse press
                 current_state = model.data(index, Qt.ItemDataRole.CheckStateRole)
                 new_state = Qt.CheckState.Unchecked if current_state == Qt.CheckState.Checked else Qt.CheckState.Checked
 
-                print(f"🖱️ Current state: {current_state}, New state: {new_state}")
-                
                 # Set the new state
                 success = model.setData(index, new_state, Qt.ItemDataRole.CheckStateRole)
                 if success:
-                    print(f"✅ Checkbox toggled for row {index.row()}: {new_state}")
+                    logger.debug("Checkbox toggled for row %s: %s", index.row(), new_state)
                     # Force immediate update
                     model.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
                 else:
-                    print(f"❌ Failed to toggle checkbox for row {index.row()}")
+                    logger.debug("Failed to toggle checkbox for row %s", index.row())
 
                 return True
         else:
             # For all other events (Release, DblClick, etc.), just return True to consume them
-            print(f"🖱️ Ignoring event type {event.type()}")
             return True
 
         # Let Qt handle other events if not handled above
@@ -105,17 +125,59 @@ try:
 except Exception:
     TableColumn = type("TableColumn", (), {"CHECKBOX":0, "STT":1, "NAME":2, "STATUS":3, "ADB":4, "DISK_USAGE":5, "SPACER":6})
 
+
+def _row_signature(info: Dict[str, Any]) -> tuple:
+    """Các trường ảnh hưởng đến hiển thị; hai info cùng chữ ký thì không cần vẽ lại."""
+    return (
+        info.get('name'),
+        info.get('is_process_started'),
+        info.get('adb_port'),
+        info.get('disk_size_bytes'),
+        info.get('disk_usage'),
+    )
+
+
+def _format_disk(info: Dict[str, Any]) -> str:
+    """Chuỗi hiển thị cột Dung lượng, tính một lần khi hàng được ghi."""
+    disk_bytes = info.get("disk_size_bytes", 0) or 0
+    if disk_bytes > 0:
+        gb = disk_bytes / (1024**3)
+        return f"{gb:.2f} GB" if gb >= 1 else f"{disk_bytes / (1024**2):.2f} MB"
+    raw_disk = info.get("disk_usage", "")
+    return str(raw_disk) if raw_disk else "0MB"
+
 class InstancesModel(QAbstractTableModel):
     stats_updated = pyqtSignal(int, int) # total, running
+    # Các role data() có trả lời; Qt hỏi thêm Font/Background/ToolTip/... cho mọi ô
+    DATA_ROLES = frozenset((
+        Qt.ItemDataRole.DisplayRole,
+        Qt.ItemDataRole.CheckStateRole,
+        Qt.ItemDataRole.UserRole,
+        Qt.ItemDataRole.TextAlignmentRole,
+    ))
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._rows: List[Dict[str, Any]] = []  # each: {'index': int, 'info': dict, 'checked': bool}
+        # Structure-of-arrays: mỗi cột là một list song song theo row index,
+        # data() chỉ cần một phép index thay vì tra dict lồng nhau
+        self._indices: List[int] = []
+        self._names: List[Optional[str]] = []
+        self._running: List[bool] = []
+        self._adb: List[Any] = []
+        self._disk_strs: List[str] = []
+        self._checked: List[bool] = []
+        self._sigs: List[tuple] = []
+        self._info_full: List[Dict[str, Any]] = []  # info gốc, cho các trường ít dùng
+        # (tên viết thường, đang chạy, index dạng chuỗi) cho InstancesProxy.filterAcceptsRow
+        self._filter_tuples: List[Tuple[str, bool, str]] = []
+        self._columns = (self._indices, self._names, self._running, self._adb,
+                         self._disk_strs, self._checked, self._sigs, self._info_full,
+                         self._filter_tuples)
         self._ui_states: Dict[int, Any] = {}   # transient status per index
         self._index_map: Dict[int, int] = {} # Map vm_index to row_index for fast lookup
 
     def rowCount(self, parent=QModelIndex()):
-        return 0 if parent.isValid() else len(self._rows)
+        return 0 if parent.isValid() else len(self._indices)
 
     def columnCount(self, parent=QModelIndex()):
         return 7
@@ -137,23 +199,18 @@ class InstancesModel(QAbstractTableModel):
         return flags
 
     def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
-        if not index.isValid():
+        if role not in self.DATA_ROLES or not index.isValid():
             return None
         r = index.row()
         c = index.column()
-        
-        # Tối ưu hóa: Tránh truy cập self._rows nhiều lần
-        try:
-            row = self._rows[r]
-        except IndexError:
+
+        if r >= len(self._indices):
             return None
-            
-        info = row.get("info", {})
-        idx = row.get("index")
+        idx = self._indices[r]
 
         if c == 0:  # CHECKBOX column
             if role == Qt.ItemDataRole.CheckStateRole:
-                return Qt.CheckState.Checked if row.get("checked", False) else Qt.CheckState.Unchecked
+                return Qt.CheckState.Checked if self._checked[r] else Qt.CheckState.Unchecked
             return None
 
         if c == 1:  # STT column
@@ -167,7 +224,8 @@ class InstancesModel(QAbstractTableModel):
 
         if c == 2:  # NAME column
             if role == Qt.ItemDataRole.DisplayRole:
-                return info.get("name", "N/A")
+                name = self._names[r]
+                return name if name is not None else "N/A"
             if role == Qt.ItemDataRole.UserRole:
                 return idx
             return None
@@ -176,7 +234,7 @@ class InstancesModel(QAbstractTableModel):
             if role == Qt.ItemDataRole.UserRole:
                 if idx in self._ui_states:
                     return self._ui_states[idx]
-                return info.get("is_process_started", False)
+                return self._running[r]
             if role == Qt.ItemDataRole.DisplayRole:
                 # Delegate sẽ xử lý việc hiển thị text
                 return ""
@@ -184,18 +242,13 @@ class InstancesModel(QAbstractTableModel):
 
         if c == 4:  # ADB column
             if role == Qt.ItemDataRole.DisplayRole:
-                val = info.get("adb_port", "—")
+                val = self._adb[r]
                 return str(val if val not in (None, "") else "—")
             return None
 
         if c == 5:  # DISK_USAGE column
             if role == Qt.ItemDataRole.DisplayRole:
-                disk_bytes = info.get("disk_size_bytes", 0) or 0
-                if disk_bytes > 0:
-                    gb = disk_bytes / (1024**3)
-                    return f"{gb:.2f} GB" if gb >= 1 else f"{disk_bytes / (1024**2):.2f} MB"
-                raw_disk = info.get("disk_usage", "")
-                return str(raw_disk) if raw_disk else "0MB"
+                return self._disk_strs[r]
             if role == Qt.ItemDataRole.TextAlignmentRole:
                 return int(Qt.AlignmentFlag.AlignCenter)
             return None
@@ -208,8 +261,7 @@ class InstancesModel(QAbstractTableModel):
         r = index.row()
         c = index.column()
         if c == 0 and role == Qt.ItemDataRole.CheckStateRole:  # Checkbox column = 0
-            self._rows[r]["checked"] = (value == Qt.CheckState.Checked)
-            print(f"🔄 Model setData: Row {r} checked = {self._rows[r]['checked']}")
+            self._checked[r] = (value == Qt.CheckState.Checked)
             self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
             return True
         return False
@@ -224,8 +276,9 @@ class InstancesModel(QAbstractTableModel):
             # Handle dict format for backward compatibility
             new_data_map = {item['index']: item for item in items}
         
-        new_indices = set(new_data_map.keys())
-        old_indices = set(self._index_map.keys())
+        # Dùng thẳng key view của dict cho các phép tập hợp, không chép ra set
+        new_indices = new_data_map.keys()
+        old_indices = self._index_map.keys()
 
         # 1. Xác định các hàng cần xóa
         to_remove_indices = old_indices - new_indices
@@ -234,26 +287,34 @@ class InstancesModel(QAbstractTableModel):
             rows_to_remove = sorted([self._index_map[idx] for idx in to_remove_indices], reverse=True)
             for row_idx in rows_to_remove:
                 self.beginRemoveRows(QModelIndex(), row_idx, row_idx)
-                del self._rows[row_idx]
+                del self._index_map[self._indices[row_idx]]
+                for column in self._columns:
+                    del column[row_idx]
                 self.endRemoveRows()
-            # Cập nhật lại map sau khi xóa
-            self._rebuild_index_map()
+            # Chỉ các hàng sau hàng bị xóa đầu tiên bị dời vị trí
+            self._reindex_from(rows_to_remove[-1])
 
-        # 2. Xác định các hàng cần cập nhật và thêm mới
-        to_update_indices = old_indices.intersection(new_indices)
+        # 2. Xác định các hàng cần cập nhật và thêm mới (old_indices giờ đã bỏ
+        # các key vừa xóa, vốn không có trong new_indices nên kết quả không đổi)
+        to_update_indices = old_indices & new_indices
         to_add_indices = new_indices - old_indices
 
         # Cập nhật các hàng hiện có
+        changed_rows = []
         for vm_index in to_update_indices:
             row_idx = self._index_map[vm_index]
             new_info = new_data_map[vm_index]['info']
-            # So sánh sâu hơn để tránh cập nhật không cần thiết
-            if not self._are_dicts_equal(self._rows[row_idx]['info'], new_info):
-                self._rows[row_idx]['info'] = new_info
-                # Phát tín hiệu thay đổi cho cả hàng
-                first_col = self.index(row_idx, 0)
-                last_col = self.index(row_idx, self.columnCount() - 1)
-                self.dataChanged.emit(first_col, last_col)
+            new_sig = _row_signature(new_info)
+            # Luôn giữ info mới nhất, nhưng chỉ vẽ lại khi trường hiển thị đổi
+            self._info_full[row_idx] = new_info
+            if new_sig != self._sigs[row_idx]:
+                self._sigs[row_idx] = new_sig
+                self._store_row(row_idx, new_info)
+                changed_rows.append(row_idx)
+        # Một dataChanged cho mỗi khối hàng liên tiếp thay vì mỗi hàng một lần;
+        # UserRole đổi theo trạng thái (delegate, bộ lọc của proxy)
+        self._emit_row_ranges(changed_rows, 0, self.columnCount() - 1,
+                              [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.UserRole])
 
         # Thêm các hàng mới
         if to_add_indices:
@@ -261,48 +322,72 @@ class InstancesModel(QAbstractTableModel):
             first_row_to_add = self.rowCount()
             self.beginInsertRows(QModelIndex(), first_row_to_add, first_row_to_add + len(new_rows_data) - 1)
             for item in new_rows_data:
-                self._rows.append(dict(index=item['index'], info=item['info'], checked=False))
+                self._append_row(item['index'], item['info'])
             self.endInsertRows()
-            # Cập nhật lại map sau khi thêm
-            self._rebuild_index_map()
 
         # 3. Tính toán và phát tín hiệu thống kê
         total_count = self.rowCount()
-        running_count = sum(1 for row in self._rows if row.get('info', {}).get('is_process_started'))
+        running_count = sum(self._running)
         self.stats_updated.emit(total_count, running_count)
 
-    def _rebuild_index_map(self):
-        """Xây dựng lại map từ vm_index sang row index."""
-        self._index_map = {row['index']: i for i, row in enumerate(self._rows)}
-
-    def _are_dicts_equal(self, d1: Dict, d2: Dict) -> bool:
-        """So sánh hai dictionary, bỏ qua một số key không quan trọng."""
-        # Các key có thể thay đổi thường xuyên nhưng không ảnh hưởng đến hiển thị
-        ignored_keys = {'pid', 'headless_pid', 'main_wnd', 'render_wnd'}
-        keys1 = set(d1.keys()) - ignored_keys
-        keys2 = set(d2.keys()) - ignored_keys
-        if keys1 != keys2:
-            return False
-        for key in keys1:
-            if d1[key] != d2[key]:
-                return False
-        return True
+    def _emit_row_ranges(self, rows: List[int], first_col: int, last_col: int, roles: List[int]):
+        """Phát dataChanged một lần cho mỗi dải hàng liên tiếp trong rows."""
+        if not rows:
+            return
+        rows = sorted(rows)
+        start = prev = rows[0]
+        for row in rows[1:]:
+            if row != prev + 1:
+                self.dataChanged.emit(self.index(start, first_col), self.index(prev, last_col), roles)
+                start = row
+            prev = row
+        self.dataChanged.emit(self.index(start, first_col), self.index(prev, last_col), roles)
+
+    def _append_row(self, vm_index: int, info: Dict[str, Any]):
+        """Thêm một hàng (chưa được chọn) vào cuối các mảng cột."""
+        row_idx = len(self._indices)
+        for column in self._columns:
+            column.append(None)
+        self._indices[row_idx] = vm_index
+        self._checked[row_idx] = False
+        self._sigs[row_idx] = _row_signature(info)
+        self._store_row(row_idx, info)
+        self._index_map[vm_index] = row_idx
+
+    def _store_row(self, row_idx: int, info: Dict[str, Any]):
+        """Ghi info và các trường hiển thị của nó vào hàng row_idx."""
+        self._info_full[row_idx] = info
+        self._names[row_idx] = info.get("name")
+        self._running[row_idx] = bool(info.get("is_process_started"))
+        self._adb[row_idx] = info.get("adb_port", "—")
+        self._disk_strs[row_idx] = _format_disk(info)
+        self._filter_tuples[row_idx] = (
+            (self._names[row_idx] or "").lower(),
+            self._running[row_idx],
+            str(self._indices[row_idx]).lower(),
+        )
+
+    def _reindex_from(self, first_row: int):
+        """Cập nhật map vm_index -> row index cho các hàng từ first_row trở đi."""
+        indices = self._indices
+        for i in range(first_row, len(indices)):
+            self._index_map[indices[i]] = i
 
     def update_row_by_index(self, idx: int, info: Dict[str, Any]):
         """Cập nhật thông tin cho một hàng dựa trên vm_index."""
         if idx in self._index_map:
             row_idx = self._index_map[idx]
-            self._rows[row_idx]["info"] = info
+            self._sigs[row_idx] = _row_signature(info)
+            self._store_row(row_idx, info)
             tl = self.index(row_idx, 0)
             br = self.index(row_idx, self.columnCount()-1)
             self.dataChanged.emit(tl, br, [])
 
     def set_all_checked(self, checked: bool):
         """Tối ưu hóa: Chỉ phát tín hiệu dataChanged cho cột checkbox."""
-        if not self._rows: return
+        if not self._indices: return
         # Không cần layoutAboutToBeChanged/layoutChanged vì layout không đổi
-        for row in self._rows:
-            row["checked"] = checked
+        self._checked[:] = [checked] * len(self._checked)
         
         if self.rowCount() > 0:
             # Chỉ cần phát tín hiệu cho cột checkbox (column 0)
@@ -311,46 +396,52 @@ class InstancesModel(QAbstractTableModel):
             self.dataChanged.emit(tl, br, [Qt.ItemDataRole.CheckStateRole])
 
     def get_checked_indices(self) -> List[int]:
-        return [row["index"] for row in self._rows if row.get("checked")]
+        return [idx for idx, checked in zip(self._indices, self._checked) if checked]
 
     def find_source_row_by_index(self, idx: int) -> int:
         return self._index_map.get(idx, -1)
 
     def set_ui_states(self, ui_states: Dict[int, Any]):
         """Set transient ui status ('starting', 'stopping', ...) and refresh status column."""
+        old_states = self._ui_states
         self._ui_states = dict(ui_states or {})
-        if self.rowCount() > 0:
-            tl = self.index(0, 3)  # STATUS column
-            br = self.index(self.rowCount()-1, 3)  # STATUS column
-            self.dataChanged.emit(tl, br, [Qt.ItemDataRole.UserRole])
+        # Chỉ vẽ lại ô trạng thái của các máy có trạng thái tạm thời thay đổi
+        changed = [idx for idx in old_states.keys() | self._ui_states.keys()
+                   if old_states.get(idx) != self._ui_states.get(idx)]
+        rows = [self._index_map[idx] for idx in changed if idx in self._index_map]
+        self._emit_row_ranges(rows, 3, 3, [Qt.ItemDataRole.UserRole])  # STATUS column
 
 class InstancesProxy(QSortFilterProxyModel):
+    # Mã trạng thái lọc, đổi từ chuỗi combobox một lần trong set_filters
+    STATUS_ALL, STATUS_RUNNING, STATUS_STOPPED = 0, 1, 2
+    STATUS_CODES = {"Đang chạy": STATUS_RUNNING, "Đã tắt": STATUS_STOPPED}
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._keyword = ""
         self._status = "Tất cả"
+        self._status_code = self.STATUS_ALL
         self.setDynamicSortFilter(True)
         self.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
 
     def set_filters(self, keyword: str, status: str):
         self._keyword = (keyword or "").strip().lower()
         self._status = status or "Tất cả"
+        self._status_code = self.STATUS_CODES.get(self._status, self.STATUS_ALL)
         self.invalidateFilter()
 
     def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
         m: InstancesModel = self.sourceModel()  # type: ignore
         if m is None: return True
+        name_l, running, idx_l = m._filter_tuples[source_row]
         # status
-        row = m._rows[source_row]
-        info = row.get("info", {})
-        running = info.get("is_process_started", False)
-        if self._status == "Đang chạy" and not running: return False
-        if self._status == "Đã tắt" and running: return False
+        status_code = self._status_code
+        if status_code == self.STATUS_RUNNING and not running: return False
+        if status_code == self.STATUS_STOPPED and running: return False
         # keyword
         if not self._keyword:
             return True
-        name = (info.get("name") or "").lower()
-        return self._keyword in name or self._keyword == str(row.get("index", "")).lower()
+        return self._keyword in name_l or self._keyword == idx_l
 
     def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
         # Override STT to show VM index and provide proper sorting
@@ -361,8 +452,7 @@ class InstancesProxy(QSortFilterProxyModel):
                 
             source_index = self.mapToSource(index)
             if source_index.isValid():
-                row_data = self.sourceModel()._rows[source_index.row()]
-                vm_index = row_data.get("index")
+                vm_index = self.sourceModel()._indices[source_index.row()]
                 
                 if role == Qt.ItemDataRole.DisplayRole:
                     return str(vm_index) if vm_index is not None else "N/A"
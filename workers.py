@@ -1,9 +1,18 @@
 import time
 import os
-import shutil
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import partial
 from typing import Callable, Any, Dict, List
 
-from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtCore import QThread, QMutex, QWaitCondition, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+# Tác vụ quét thư mục chỉ báo tiến độ qua log sau mỗi ngần này thư mục
+SCAN_LOG_EVERY_DIRS = 100
+# Số luồng cho các tác vụ xóa/sao chép file (IO nhả GIL nên chạy song song được)
+FILE_IO_WORKERS = 8
 
 # Khai báo trước (Forward declaration) để tránh lỗi import vòng tròn
 class MumuManager:
@@ -27,14 +36,16 @@ class GenericWorker(QThread):
         self.params = params
         self._is_running = True
         self._is_paused = False
+        # Worker đang tạm dừng ngủ trên _resume_cond đến khi resume()/stop()
+        self._mutex = QMutex()
+        self._resume_cond = QWaitCondition()
 
     def run(self):
         """Phương thức chính của luồng, được gọi khi self.start() được gọi."""
         try:
             result = self.task_func(self, self.manager, self.params)
             if result:
-                # Debug logging for result structure
-                self.log.emit(f"🔍 Worker result: type={type(result)}, keys={list(result.keys()) if isinstance(result, dict) else 'N/A'}")
+                logger.debug("Worker result: type=%s", type(result))
                 self.task_result.emit(result)
             else:
                 self.log.emit(f"⚠️ Worker: task_func returned empty result: {result}")
@@ -48,23 +59,36 @@ class GenericWorker(QThread):
 
     def stop(self):
         """Yêu cầu dừng worker."""
+        self._mutex.lock()
         self._is_running = False
+        self._resume_cond.wakeAll()
+        self._mutex.unlock()
 
     def pause(self):
         """Tạm dừng worker."""
+        self._mutex.lock()
         self._is_paused = True
+        self._mutex.unlock()
 
     def resume(self):
         """Tiếp tục worker."""
+        self._mutex.lock()
         self._is_paused = False
+        self._resume_cond.wakeAll()
+        self._mutex.unlock()
 
     def check_status(self):
         """Kiểm tra xem worker có nên dừng hoặc tạm dừng không. Cần được gọi bên trong task_func."""
-        while self._is_paused:
+        if self._is_paused:
+            self._mutex.lock()
+            try:
+                while self._is_paused and self._is_running:
+                    self._resume_cond.wait(self._mutex)
+            finally:
+                self._mutex.unlock()
             if not self._is_running:
                 raise InterruptedError("Tác vụ đã bị dừng khi đang tạm dừng.")
-            self.msleep(50) # Tối ưu: Giảm từ 100ms xuống 50ms để responsive hơn
-        
+
         if not self._is_running:
             raise InterruptedError("Tác vụ đã bị người dùng dừng.")
 
@@ -74,6 +98,65 @@ class InterruptedError(Exception):
 
 # --- CÁC HÀM TÁC VỤ (TASK FUNCTIONS) ---
 
+def _progress_pct(done: int, total: int) -> int:
+    """Phần trăm hoàn thành (0-100) bằng phép chia nguyên."""
+    return done * 100 // total if total > 0 else 100
+
+class _ProgressReporter:
+    """Chỉ phát worker.progress khi phần trăm thay đổi: tối đa 101 tín hiệu mỗi tác vụ."""
+
+    def __init__(self, worker: GenericWorker, total: int):
+        self._emit = worker.progress.emit
+        self._total = total
+        self._last = -1
+
+    def update(self, done: int):
+        pct = _progress_pct(done, self._total)
+        if pct != self._last:
+            self._last = pct
+            self._emit(pct)
+
+def _run_file_ops(worker: GenericWorker, func: Callable[[str], Any], paths: List[str],
+                  done_label: str, error_label: str) -> Dict[str, List[str]]:
+    """
+    Chạy func(path) cho từng path trên một thread pool, báo log/tiến độ theo
+    thứ tự hoàn thành. Chỉ giữ tối đa FILE_IO_WORKERS việc đang chạy và gọi
+    check_status() trước mỗi lần submit, nên tạm dừng/dừng có hiệu lực ngay.
+    """
+    results = {'success': [], 'failed': []}
+    progress = _ProgressReporter(worker, len(paths))
+    with ThreadPoolExecutor(max_workers=FILE_IO_WORKERS, thread_name_prefix="FileOpWorker") as executor:
+        try:
+            pending = {}
+            remaining = iter(paths)
+            done = 0
+            while True:
+                for path in remaining:
+                    worker.check_status()
+                    pending[executor.submit(func, path)] = path
+                    if len(pending) >= FILE_IO_WORKERS:
+                        break
+                if not pending:
+                    break
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    worker.check_status()
+                    path = pending.pop(future)
+                    done += 1
+                    try:
+                        future.result()
+                        worker.log.emit(f"✅ {done_label}: {path}")
+                        results['success'].append(path)
+                    except Exception as e:
+                        worker.log.emit(f"❌ {error_label} {path}: {e}")
+                        results['failed'].append(path)
+                    progress.update(done)
+        except InterruptedError:
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+    return results
+
 def auto_launch_task(worker: GenericWorker, manager: MumuManager, params: Dict[str, Any]):
     """Tác vụ tự động khởi động các máy ảo theo batch."""
     start_idx, end_idx = params['start'], params['end']
@@ -84,28 +167,40 @@ def auto_launch_task(worker: GenericWorker, manager: MumuManager, params: Dict[s
     worker.started.emit(f"---   Bắt đầu tự động hóa: {total} máy ảo từ {start_idx} đến {end_idx} ---")
     
     results = {'success': [], 'failed': []}
-    
+    progress = _ProgressReporter(worker, total)
+
     for i in range(0, total, batch_size):
         worker.check_status()
         batch = indices[i:i+batch_size]
         worker.log.emit(f"\n--- Đang xử lý Batch: {', '.join(map(str, batch))} ---")
-        
-        for j, index in enumerate(batch):
-            worker.check_status()
-            worker.log.emit(f"[{index}] Đang khởi động...")
-            ok, msg = manager.control_instance([index], 'launch')
+
+        if inst_delay <= 0:
+            # Không cần giãn cách: một lệnh MuMuManager cho cả batch thay vì
+            # mỗi máy một tiến trình CLI
+            ok, msg = manager.control_instance(batch, 'launch')
             if ok:
-                results['success'].append(index)
-                worker.log.emit(f"[{index}] Khởi động thành công.")
+                results['success'].extend(batch)
+                worker.log.emit(f"[{', '.join(map(str, batch))}] Khởi động thành công.")
             else:
-                results['failed'].append(index)
-                worker.log.emit(f"[{index}] Lỗi: {msg}")
-            
-            progress_val = int(((i + j + 1) / total) * 100)
-            worker.progress.emit(progress_val)
-            
-            if j < len(batch) - 1:
-                worker.msleep(int(inst_delay*1000))
+                results['failed'].extend(batch)
+                worker.log.emit(f"[{', '.join(map(str, batch))}] Lỗi: {msg}")
+            progress.update(i + len(batch))
+        else:
+            for j, index in enumerate(batch):
+                worker.check_status()
+                worker.log.emit(f"[{index}] Đang khởi động...")
+                ok, msg = manager.control_instance([index], 'launch')
+                if ok:
+                    results['success'].append(index)
+                    worker.log.emit(f"[{index}] Khởi động thành công.")
+                else:
+                    results['failed'].append(index)
+                    worker.log.emit(f"[{index}] Lỗi: {msg}")
+
+                progress.update(i + j + 1)
+
+                if j < len(batch) - 1:
+                    worker.msleep(int(inst_delay*1000))
 
         if i + batch_size < total:
             worker.log.emit(f"--- Hoàn thành Batch. Tạm nghỉ {batch_delay} giây... ---")
@@ -118,6 +213,7 @@ def batch_sim_edit_task(worker: GenericWorker, manager: MumuManager, tasks: List
     total = len(tasks)
     worker.started.emit(f"--- 🔧 Bắt đầu sửa thông tin cho {total} máy ảo ---")
     results = {'success': [], 'failed': []}
+    progress = _ProgressReporter(worker, total)
 
     for i, task in enumerate(tasks):
         worker.check_status()
@@ -134,7 +230,7 @@ def batch_sim_edit_task(worker: GenericWorker, manager: MumuManager, tasks: List
                 results['failed'].append(index)
                 worker.log.emit(f"[{index}] Lỗi đổi IMEI: {msg}")
 
-        worker.progress.emit(int(((i + 1) / total) * 100))
+        progress.update(i + 1)
         # Tối ưu: Giảm delay từ 100ms xuống 50ms để nhanh hơn
         worker.msleep(50)
         
@@ -181,6 +277,33 @@ def restart_instances_task(worker: GenericWorker, manager: MumuManager, params:
 
     return results
 
+def _scan_entry(worker: GenericWorker, entry: os.DirEntry, exclude_dir, stats: Dict[str, int]):
+    """
+    Sinh ra các file nằm dưới entry (hoặc chính entry nếu là file), duyệt đệ quy
+    bằng os.scandir. Loại của entry lấy từ kết quả readdir nên không tốn thêm
+    stat. Giống os.walk: không đi vào symlink thư mục, bỏ qua thư mục không đọc được.
+    """
+    if not entry.is_dir():
+        yield entry
+        return
+    if entry.is_symlink():
+        return
+    if exclude_dir and entry.name == exclude_dir:
+        worker.log.emit(f"⚠️ Đã bỏ qua thư mục: {entry.path}")
+        return
+
+    worker.check_status()
+    stats['dirs'] += 1
+    if stats['dirs'] % SCAN_LOG_EVERY_DIRS == 0:
+        worker.log.emit(f"📂 Đã quét {stats['dirs']} thư mục...")
+    try:
+        with os.scandir(entry.path) as it:
+            children = list(it)
+    except OSError:
+        return
+    for child in children:
+        yield from _scan_entry(worker, child, exclude_dir, stats)
+
 def find_disk_files_task(worker: GenericWorker, manager: MumuManager, params: dict):
     """
     Tìm kiếm các file như ota.vdi hoặc customer_config.json trong thư mục vms.
@@ -203,52 +326,34 @@ def find_disk_files_task(worker: GenericWorker, manager: MumuManager, params: di
         worker.log.emit(f"❌ Đường dẫn không phải là thư mục: {vms_path}")
         return {'files': found_files, 'type': file_type}
     
-    # Liệt kê nội dung thư mục gốc để debug
+    # Đọc thư mục gốc một lần; các mục con cấp 1 (thường mỗi máy ảo một
+    # thư mục) làm mốc tiến độ thay cho việc đếm trước toàn bộ cây thư mục
     try:
-        root_contents = os.listdir(vms_path)
-        worker.log.emit(f"📁 Nội dung thư mục '{vms_path}': {root_contents}")
+        with os.scandir(vms_path) as it:
+            top_entries = list(it)
+        logger.debug("Nội dung thư mục '%s': %s", vms_path, [e.name for e in top_entries])
     except Exception as e:
         worker.log.emit(f"❌ Lỗi đọc thư mục: {e}")
         return {'files': found_files, 'type': file_type}
-    
-    total_dirs = sum(1 for _ in os.walk(vms_path))
-    count = 0
 
-    # os.walk cho phép sửa đổi danh sách 'dirs' để bỏ qua các thư mục con
-    for root, dirs, files in os.walk(vms_path):
+    target = file_type.lower()
+    progress = _ProgressReporter(worker, len(top_entries))
+    stats = {'dirs': 1}
+
+    for i, top_entry in enumerate(top_entries):
         worker.check_status()
-        
-        # Debug: log thư mục hiện tại
-        worker.log.emit(f"📂 Đang quét thư mục: {root}")
-        worker.log.emit(f"📋 Files trong thư mục: {list(files)}")
-        
-        # === LOGIC LOẠI TRỪ THƯ MỤC ===
-        # Nếu thư mục cần loại trừ nằm trong danh sách các thư mục con sắp duyệt
-        if exclude_dir and exclude_dir in dirs:
-            # Xóa nó khỏi danh sách. os.walk sẽ không đi vào thư mục này.
-            dirs.remove(exclude_dir)
-            worker.log.emit(f"⚠️ Đã bỏ qua thư mục: {os.path.join(root, exclude_dir)}")
-        # =================================
-
-        for file in files:
-            # Debug: in thông tin file hiện tại
-            worker.log.emit(f"🔍 Kiểm tra file: '{file}' so với pattern: '{file_type}'")
-            
-            if file.lower() == file_type.lower():
-                full_path = os.path.join(root, file)
-                found_files.append(full_path)
-                worker.log.emit(f"✅ Đã tìm thấy: {full_path}")
-            
-            # Kiểm tra thêm các pattern khác có thể
-            if 'ota' in file.lower() and '.vdi' in file.lower():
-                full_path = os.path.join(root, file)
-                if full_path not in found_files:  # Tránh duplicate
-                    found_files.append(full_path)
-                    worker.log.emit(f"✅ Tìm thấy file OTA VDI: {full_path}")
+        for entry in _scan_entry(worker, top_entry, exclude_dir, stats):
+            # Khớp đúng tên cần tìm, hoặc các biến thể OTA VDI khác. Mỗi file
+            # chỉ được duyệt một lần nên không cần kiểm tra trùng lặp
+            name = entry.name.lower()
+            if name == target:
+                found_files.append(entry.path)
+                worker.log.emit(f"✅ Đã tìm thấy: {entry.path}")
+            elif 'ota' in name and '.vdi' in name:
+                found_files.append(entry.path)
+                worker.log.emit(f"✅ Tìm thấy file OTA VDI: {entry.path}")
 
-        count += 1
-        if total_dirs > 0:
-            worker.progress.emit(int((count / total_dirs) * 100))
+        progress.update(i + 1)
 
     worker.log.emit(f"Tìm kiếm hoàn tất. Tìm thấy {len(found_files)} file.")
     return {'files': found_files, 'type': file_type}
@@ -258,37 +363,30 @@ def delete_disk_files_task(worker: GenericWorker, manager: MumuManager, params:
     files_to_delete = params['files_to_delete']
     total = len(files_to_delete)
     worker.started.emit(f"--- 🗑️ Bắt đầu xóa {total} file ota.vdi ---")
-    results = {'success': [], 'failed': []}
-    
-    for i, file_path in enumerate(files_to_delete):
-        worker.check_status()
-        try:
-            os.remove(file_path)
-            worker.log.emit(f"✅ Đã xóa: {file_path}")
-            results['success'].append(file_path)
-        except Exception as e:
-            worker.log.emit(f"❌ Lỗi khi xóa {file_path}: {e}")
-            results['failed'].append(file_path)
-        worker.progress.emit(int(((i + 1) / total) * 100))
-        
-    return results
+    return _run_file_ops(worker, os.remove, files_to_delete, "Đã xóa", "Lỗi khi xóa")
 
 # --- TÁC VỤ MỚI CHO TAB THAY CONFIG ---
 
 def find_config_files_task(worker: GenericWorker, manager: MumuManager, params: Dict[str, Any]):
     """Tác vụ tìm kiếm các file customer_config.json."""
-    vms_path = params[r'C:\Program Files\Netease\MuMuPlayer\vms']
+    vms_path = params['vms_path']
     worker.started.emit(f"--- 🔍 Bắt đầu tìm kiếm file customer_config.json trong {vms_path} ---")
     found_files = []
-    
-    for root, dirs, files in os.walk(vms_path):
-        worker.check_status()
-        for file in files:
-            if file.lower() == 'customer_config.json':
-                full_path = os.path.join(root, file)
-                found_files.append(full_path)
-                worker.log.emit(f"Tìm thấy: {full_path}")
-    
+
+    try:
+        with os.scandir(vms_path) as it:
+            top_entries = list(it)
+    except OSError as e:
+        worker.log.emit(f"❌ Lỗi đọc thư mục: {e}")
+        return {'files': found_files, 'type': 'customer_config.json'}
+
+    stats = {'dirs': 1}
+    for top_entry in top_entries:
+        for entry in _scan_entry(worker, top_entry, None, stats):
+            if entry.name.lower() == 'customer_config.json':
+                found_files.append(entry.path)
+                worker.log.emit(f"Tìm thấy: {entry.path}")
+
     worker.progress.emit(100)
     return {'files': found_files, 'type': 'customer_config.json'}
 
@@ -298,17 +396,20 @@ def replace_config_files_task(worker: GenericWorker, manager: MumuManager, param
     target_files = params['target_files']
     total = len(target_files)
     worker.started.emit(f"--- 🔄 Bắt đầu thay thế {total} file config ---")
-    results = {'success': [], 'failed': []}
-    
-    for i, target_file in enumerate(target_files):
-        worker.check_status()
-        try:
-            shutil.copy2(source_file, target_file)
-            worker.log.emit(f"✅ Đã thay thế: {target_file}")
-            results['success'].append(target_file)
-        except Exception as e:
-            worker.log.emit(f"❌ Lỗi khi thay thế {target_file}: {e}")
-            results['failed'].append(target_file)
-        worker.progress.emit(int(((i + 1) / total) * 100))
-        
-    return results
\ No newline at end of file
+
+    # File config nhỏ: đọc nguồn một lần rồi ghi thẳng ra từng file đích,
+    # không mở lại nguồn và không sao chép metadata như shutil.copy2
+    try:
+        with open(source_file, 'rb') as f:
+            source_bytes = f.read()
+    except OSError as e:
+        worker.log.emit(f"❌ Không đọc được file nguồn {source_file}: {e}")
+        return {'success': [], 'failed': list(target_files)}
+
+    return _run_file_ops(worker, partial(_write_file_bytes, source_bytes), target_files,
+                         "Đã thay thế", "Lỗi khi thay thế")
+
+def _write_file_bytes(data: bytes, path: str):
+    """Ghi đè path bằng data."""
+    with open(path, 'wb') as f:
+        f.write(data)
\ No newline at end of file